@@ -1,9 +1,37 @@
+import concurrent.futures
+import functools
+import math
+import multiprocessing
 import random
 
-import streamlit as st
+import numpy as np
+
+from algorithmen.primzahltest import (
+    BATCH_LIMIT,
+    PRIMORIAL_LIMIT,
+    integer_root,
+    is_prime_many,
+    millerrabin,
+    montgomery_mul,
+    montgomery_setup,
+    primes,
+    primorial,
+    small_factors,
+    small_primes,
+)
 
 # ----------------------------------------PRIMFAKTORZERLEGUNG----------------------------------------
 
+# rho steps between two gcds in pollard_rho
+RHO_BLOCK = 100
+# steps of the first walk in factors_pollard, doubled for every further round
+RHO_WALK_LIMIT = 1 << 16
+# below this many lanes a numpy step costs more than the same steps in python
+RHO_LANES_MIN = 64
+
+# set in the pool workers of factors_pollard, ends all walks once one has won
+walk_stop = None
+
 
 def ggt(a, b):
     while b:
@@ -11,33 +39,76 @@ def ggt(a, b):
     return a
 
 
-def pollard_rho(n, verbose):
+def rho_walk(n, y, c, limit=None, trace=None):
+    # one Brent walk from y with x^2 + c, one gcd per block of RHO_BLOCK steps on the
+    # product of the differences. Returns (d, steps) with d a divisor > 1 (n if the
+    # walk failed) or None once limit steps are used up or the race is decided
+    d, q, r = 1, 1, 1
+    steps = 0
+    while d == 1:
+        # x stays fixed while y walks r further steps, r doubles every round
+        x = y
+        for _ in range(r):
+            y = (y * y + c) % n
+        steps += r
+        k = 0
+        while k < r and d == 1:
+            ys = y
+            block = min(RHO_BLOCK, r - k)
+            for _ in range(block):
+                y = (y * y + c) % n
+                q = q * abs(x - y) % n
+            d = ggt(q, n)
+            k += block
+            steps += block
+            if trace is not None:
+                trace(
+                    "Nach {} Schritten ist x = {} und y = {}, der ggT des Produkts der Differenzen |x - y| mit n ist d = {}",
+                    steps,
+                    x,
+                    y,
+                    d,
+                )
+            if d == 1 and limit is not None and steps >= limit:
+                return None, steps
+            if d == 1 and walk_stop is not None and walk_stop.is_set():
+                return None, steps
+        r *= 2
+
+    if d == n:
+        # the block product hit a multiple of n, repeat the block one gcd per step
+        if trace is not None:
+            trace("Da d = n ist, wird der letzte Block Schritt für Schritt wiederholt.")
+        d = 1
+        while d == 1:
+            ys = (ys * ys + c) % n
+            d = ggt(abs(x - ys), n)
+    return d, steps
+
+
+def pollard_rho(n, trace=None, limit=None):
+    # limit caps the number of steps over all walks, None is returned once it is used up
     if n % 2 == 0:
-        if verbose is True:
-            st.write(f"Da {n} eine gerade Zahl ist ist 2 ein Primfaktor")
+        if trace is not None:
+            trace("Da {} eine gerade Zahl ist ist 2 ein Primfaktor", n)
         return 2
 
-    x = random.randint(1, n - 1)
-    y = x
-    c = random.randint(1, n - 1)
-    d = 1
-    if verbose is True:
-        st.write(
-            f"Es werden für x, y, c zufällige Werte zwischen definiert: x = {x}, y = {y} und c = {c} "
-        )
-    while d == 1:
-        x = (x * x + c) % n
-        y = (y * y + c) % n
-        y = (y * y + c) % n
-        d = ggt(abs(x - y), n)
-        if verbose is True:
-            st.write(
-                f" die Wert x und y  werden quadriert und c addiert. Für y ein weiteres Mal. d wird der ggT von (|(x - y)|, n).  x = {x}, y = {y} und d = {d}"
-            )
-        if d == n:
-            return pollard_rho(n, verbose)
-    if verbose is True:
-        st.write(f"Da der ggT {d} ungleich 1 ist muss {d} ein Primfaktor sein")
+    steps = 0
+    while True:
+        y = random.randint(1, n - 1)
+        c = random.randint(1, n - 1)
+        if trace is not None:
+            trace("Es werden für y und c zufällige Werte definiert: y = {} und c = {}", y, c)
+        d, used = rho_walk(n, y, c, None if limit is None else limit - steps, trace)
+        steps += used
+        if d is None:
+            return None
+        if d != n:
+            break
+        if trace is not None:
+            trace("Der Lauf hat nur den Teiler n gefunden, es wird mit neuen Werten neu begonnen.")
+    if trace is not None:
+        trace("Da der ggT {} ungleich 1 ist muss {} ein Primfaktor sein", d, d)
     return d
 
 
@@ -48,6 +119,12 @@ def is_prime(n):
         return True
     if n % 2 == 0 or n % 3 == 0:
         return False
+    if n >= PRIMORIAL_LIMIT:
+        # one gcd replaces the trial divisions below PRIMORIAL_LIMIT, below its square
+        # that already decides, above it the deterministic Miller-Rabin does
+        if math.gcd(n, primorial()) > 1:
+            return False
+        return n < PRIMORIAL_LIMIT**2 or millerrabin(n, 0, None, mode="deterministic")
     i = 5
     while i * i <= n:
         if n % i == 0 or n % (i + 2) == 0:
@@ -56,84 +133,531 @@ def is_prime(n):
     return True
 
 
-def factors_pollard(n, verbose):
+def init_rho_worker(stop):
+    global walk_stop
+    walk_stop = stop
+
+
+def race_walks(n, executor, stop, walks, limit):
+    # runs walks independent walks in the pool, the first divisor wins and the
+    # others stop at their next block
+    stop.clear()
+    futures = [
+        executor.submit(rho_walk, n, random.randint(1, n - 1), random.randint(1, n - 1), limit)
+        for _ in range(walks)
+    ]
+    result = None
+    for future in concurrent.futures.as_completed(futures):
+        d, _ = future.result()
+        if d is not None and d != n:
+            result = d
+            stop.set()
+            break
+    concurrent.futures.wait(futures)
+    return result
+
+
+def find_factor(n, trace=None, executor=None, stop=None, walks=1):
+    # divisor 1 < d < n of an odd composite n, the budget per walk doubles after every
+    # round without one, so no single unlucky walk can stall the factorization
+    limit = RHO_WALK_LIMIT
+    while True:
+        if executor is None:
+            d = pollard_rho(n, trace, limit)
+        else:
+            if trace is not None:
+                trace("Es werden {} unabhängige Läufe mit je {} Schritten parallel gestartet.", walks, limit)
+            d = race_walks(n, executor, stop, walks, limit)
+        if d is not None:
+            return d
+        limit *= 2
+
+
+def factors_pollard(n, trace=None, workers=1):
+    # iterative, the cofactors still to be split wait on a stack. With workers > 1
+    # every split races that many walks in a process pool
     if n <= 1:
         return []
-    if is_prime(n):
-        if verbose is True:
-            st.write(f"{n} ist ein Primfaktor")
-        return [n]
-    factor = pollard_rho(n, verbose)
-    return factors_pollard(factor, verbose) + factors_pollard(n // factor, verbose)
+    small, n = small_factors(n)
+    if small and trace is not None:
+        trace("Die kleinen Primfaktoren {} werden mit einem ggT abgespalten.", small)
 
+    executor, stop = None, None
+    if workers > 1 and n > 1 and not is_prime(n):
+        stop = multiprocessing.Event()
+        executor = concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=init_rho_worker, initargs=(stop,)
+        )
+    factors = list(small)
+    stack = [n] if n > 1 else []
+    try:
+        while stack:
+            m = stack.pop()
+            if is_prime(m):
+                if trace is not None:
+                    trace("{} ist ein Primfaktor", m)
+                factors.append(m)
+                continue
+            d = find_factor(m, trace, executor, stop, workers)
+            stack += [d, m // d]
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return sorted(factors)
 
-def williams_p_plus_1(n, verbose):
+
+def rho_many(n, limit=None, rng=None):
+    # one Brent walk per lane on odd composite uint64 n < BATCH_LIMIT in Montgomery
+    # form, every lane multiplies its differences into its own product and all lanes
+    # share one np.gcd per block. Returns the divisor per lane, 0 where the walk is not
+    # done once limit steps are used up or fewer than RHO_LANES_MIN lanes are left
+    rng = rng or np.random.default_rng()
+    lanes = np.arange(len(n))
+    result = np.zeros(len(n), dtype=np.uint64)
+    n_inv, one, _ = montgomery_setup(n)
+    y = rng.integers(1, n, dtype=np.uint64)
+    c = rng.integers(1, n, dtype=np.uint64)
+    q = one.copy()
+
+    def step(y, c, n, n_inv):
+        # y^2 + c in Montgomery form, the map stays a random polynomial mod every p
+        y = montgomery_mul(y, y, n, n_inv) + c
+        return y - n * (y >= n)
+
+    steps, r = 0, 1
+    while len(lanes) >= RHO_LANES_MIN and (limit is None or steps < limit):
+        x = y
+        for _ in range(r):
+            y = step(y, c, n, n_inv)
+        steps += r
+        k = 0
+        while k < r and len(lanes) >= RHO_LANES_MIN:
+            ys = y
+            block = min(RHO_BLOCK, r - k)
+            for _ in range(block):
+                y = step(y, c, n, n_inv)
+                # |x - y| up to the sign, which does not change the gcd
+                q = montgomery_mul(q, x - y + n * (x < y), n, n_inv)
+            k += block
+            steps += block
+            g = np.gcd(q, n)
+
+            failed = np.flatnonzero(g == n)
+            if len(failed):
+                # the block product hit a multiple of n, repeat the block one gcd per step
+                fx, fy, fc, fn, f_inv = x[failed], ys[failed], c[failed], n[failed], n_inv[failed]
+                fg = np.ones(len(failed), dtype=np.uint64)
+                for _ in range(block):
+                    fy = step(fy, fc, fn, f_inv)
+                    fg = np.where(fg == 1, np.gcd(fx - fy + fn * (fx < fy), fn), fg)
+                g[failed] = fg
+                # lanes that only find n again start a new walk
+                again = failed[fg == fn]
+                y[again] = x[again] = rng.integers(1, n[again], dtype=np.uint64)
+                c[again] = rng.integers(1, n[again], dtype=np.uint64)
+                q[again] = one[again]
+                g[again] = 1
+
+            done = g != 1
+            if done.any():
+                result[lanes[done]] = g[done]
+                lanes, n, n_inv, one, x, y, c, q = (
+                    v[~done] for v in (lanes, n, n_inv, one, x, y, c, q)
+                )
+        r *= 2
+    return result
+
+
+def factors_pollard_many(numbers):
+    # prime factors of a whole batch, the word-size composites are split together in
+    # rho_many and only the walks it leaves over fall back to factors_pollard
+    result, pending = [], []
+    for i, n in enumerate(numbers):
+        n = int(n)
+        small, m = small_factors(n) if n > 1 else ([], 1)
+        result.append(small)
+        if m > 1:
+            pending.append((i, m))
+
+    while pending:
+        composite = []
+        for (i, m), prime in zip(pending, is_prime_many([m for _, m in pending]).tolist()):
+            if prime:
+                result[i].append(m)
+            elif m < BATCH_LIMIT:
+                composite.append((i, m))
+            else:
+                result[i] += factors_pollard(m)
+        pending = []
+        if not composite:
+            break
+        divisors = rho_many(np.array([m for _, m in composite], dtype=np.uint64))
+        for (i, m), d in zip(composite, divisors.tolist()):
+            if d == 0:
+                result[i] += factors_pollard(m)
+            else:
+                pending += [(i, d), (i, m // d)]
+    return [sorted(factors) for factors in result]
+
+
+# smoothness bound of stage 1 in williams_p_plus_1, stage 2 goes up to WILLIAMS_B2_FACTOR * B1
+WILLIAMS_B1 = 2000
+WILLIAMS_B2_FACTOR = 50
+# start values P, P^2 - 4 = 5, 12, 32, 21 lie in different square classes, so every
+# seed has its own chance that p + 1 and not p - 1 is the order
+WILLIAMS_SEEDS = (3, 4, 6, 5)
+# stage 2 splits the primes as q = mD +- j with j < D / 2
+WILLIAMS_D = 210
+# primes of stage 2 between two gcds
+WILLIAMS_GCD_BLOCK = 1000
+# rounds of factors_williams, B1 is quadrupled for every further round
+WILLIAMS_ROUNDS = 3
+
+
+@functools.lru_cache()
+def prime_power_product(bound):
+    # product of the largest powers p^e <= bound of all primes p <= bound
+    product = 1
+    for p in small_primes(bound + 1).tolist():
+        q = p
+        while q * p <= bound:
+            q *= p
+        product *= q
+    return product
+
+
+def lucas_v(k, x, n):
+    # V_k mod n of the Lucas sequence with V_0 = 2, V_1 = x and Q = 1, ladder over
+    # (V_j, V_j+1) with V_2j = V_j^2 - 2 and V_2j+1 = V_j V_j+1 - x
+    if k == 0:
+        return 2 % n
+    a, b = x % n, (x * x - 2) % n
+    for bit in bin(k)[3:]:
+        if bit == "1":
+            a, b = (a * b - x) % n, (b * b - 2) % n
+        else:
+            a, b = (a * a - 2) % n, (a * b - x) % n
+    return a
+
+
+def williams_stage2(v, n, B1, B2):
+    # every prime B1 < q <= B2 is q = mD +- j, and V_mD = V_j mod p once the order of
+    # the seed mod p divides q. The V_j are precomputed, V_mD steps with
+    # V_(m+1)D = V_mD V_D - V_(m-1)D and the differences are multiplied up
+    D = WILLIAMS_D
+    v2 = (v * v - 2) % n
+    baby = {1: v, 3: (v * v2 - v) % n}
+    for j in range(5, D // 2, 2):
+        baby[j] = (baby[j - 2] * v2 - baby[j - 4]) % n
+    vD = lucas_v(D, v, n)
+
+    m = (B1 + 1 + D // 2) // D
+    previous, current = lucas_v(abs(m - 1) * D, v, n), lucas_v(m * D, v, n)
+    g, count = 1, 0
+    for q in primes(B1 + 1, B2 + 1):
+        while q > m * D + D // 2:
+            previous, current = current, (current * vD - previous) % n
+            m += 1
+        g = g * (current - baby[abs(q - m * D)]) % n
+        count += 1
+        if count % WILLIAMS_GCD_BLOCK == 0 and math.gcd(g, n) > 1:
+            break
+    return math.gcd(g, n)
+
+
+def williams_p_plus_1(n, trace=None, B1=WILLIAMS_B1, B2=None):
+    # divisor 1 < d < n of n or None. A prime p | n is found when p + 1 is B1-smooth up
+    # to one further prime below B2 (p - 1 for seeds whose P^2 - 4 is a square mod p)
     if n % 2 == 0:
+        if trace is not None:
+            trace("Da {} eine gerade Zahl ist ist 2 ein weiterer Primfaktor", n)
         return 2
-    if verbose is True:
-        st.write(f"Da {n} eine gerade Zahl ist ist 2 ein weiterer Primfaktor")
-
-    b = 100
-    a = random.randint(2, n - 2)
+    B2 = B2 or WILLIAMS_B2_FACTOR * B1
+    M = prime_power_product(B1)
 
-    for j in range(2, b + 1):
-        if verbose is True:
-            st.write(
-                f"Es wird der Rest der Potent von {a} hoch {j} modulo {n} brechnet"
+    for seed in WILLIAMS_SEEDS:
+        if trace is not None:
+            trace(
+                "Mit dem Startwert P = {} wird V_M(P) modulo {} für das Produkt M aller Primzahlpotenzen bis B1 = {} berechnet.",
+                seed,
+                n,
+                B1,
             )
-            st.write(f"Zudem wird der ggT von {a - 1} und {n} bestimmt. ")
-        a = pow(a, j, n)
-        d = ggt(a - 1, n)
+        v = lucas_v(M, seed, n)
+        d = math.gcd(v - 2, n)
+        if trace is not None:
+            trace("Stufe 1: Der ggT von V_M(P) - 2 = {} und {} ist {}.", (v - 2) % n, n, d)
+        if d == 1:
+            d = williams_stage2(v, n, B1, B2)
+            if trace is not None:
+                trace("Stufe 2: Der ggT der Differenzen für alle Primzahlen bis B2 = {} mit {} ist {}.", B2, n, d)
         if 1 < d < n:
-            if verbose is True:
-                st.write(
-                    f"Da der ggT ({d}) größer 1, aber kleiner {n} ist es ein Teiler."
-                )
+            if trace is not None:
+                trace("Da der ggT ({}) größer 1, aber kleiner {} ist es ein Teiler.", d, n)
             return d
 
     return None
 
 
-def factors_williams(n, verbose):
-    factors = []
-    while n % 2 == 0:
-        factors.append(2)
-        n //= 2
-        if verbose is True:
-            st.write(f"Da {n} eine gerade Zahl ist ist 2 ein weiterer Primfaktor")
-
-    while n > 1:
-        factor = williams_p_plus_1(n, verbose)
-        if not factor:
-            factors.append(n)
-            if verbose is True:
-                st.write(f"{n} ist ein weiterere Primfaktor. ")
+def factors_williams(n, trace=None):
+    # iterative like factors_pollard, a cofactor that resists WILLIAMS_ROUNDS rounds of
+    # p + 1 with growing bounds is split with pollard_rho instead
+    if n <= 1:
+        return []
+    factors, n = small_factors(n)
+    if factors and trace is not None:
+        trace("Die kleinen Primfaktoren {} werden mit einem ggT abgespalten.", factors)
+    factors = list(factors)
+
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if millerrabin(m, 0, None, mode="deterministic"):
+            if trace is not None:
+                trace("{} ist ein weiterer Primfaktor.", m)
+            factors.append(m)
+            continue
+        d, B1 = None, WILLIAMS_B1
+        for _ in range(WILLIAMS_ROUNDS):
+            d = williams_p_plus_1(m, trace, B1)
+            if d is not None:
+                break
+            B1 *= 4
+        if d is None:
+            if trace is not None:
+                trace("Williams findet keinen Teiler von {}, er wird mit Pollard-Rho gesucht.", m)
+            d = find_factor(m, trace)
+        stack += [d, m // d]
+
+    return sorted(factors)
+
+
+# smoothness bound of stage 1 in pollard_pm1, stage 2 goes up to PM1_B2_FACTOR * B1,
+# which makes both stages about equally expensive
+PM1_B1 = 10_000
+PM1_B2_FACTOR = 20
+# primes of stage 2 between two gcds
+PM1_GCD_BLOCK = 1000
+# rounds of find_factor_pm1, B1 is quadrupled for every further round
+PM1_ROUNDS = 3
+
+
+def pm1_backtrack(n, base, B1):
+    # stage 1 one prime power at a time with a gcd after each, used when the single
+    # gcd over the whole product is n
+    a = base
+    for p in small_primes(B1 + 1).tolist():
+        q = p
+        while q * p <= B1:
+            q *= p
+        a = pow(a, q, n)
+        d = math.gcd(a - 1, n)
+        if d > 1:
+            return d
+    return n
+
+
+def pm1_stage2(a, n, B1, B2):
+    # a^q for the primes B1 < q <= B2 by walking the prime gaps, a^gap comes from a
+    # table of the even powers of a that grows with the largest gap seen
+    candidates = primes(B1 + 1, B2 + 1)
+    q = next(candidates, None)
+    if q is None:
+        return 1
+    x = pow(a, q, n)
+    a2 = a * a % n
+    steps = [1, a2]
+    g, count = (x - 1) % n, 1
+    for p in candidates:
+        gap = (p - q) // 2
+        while len(steps) <= gap:
+            steps.append(steps[-1] * a2 % n)
+        x = x * steps[gap] % n
+        g = g * (x - 1) % n
+        q = p
+        count += 1
+        if count % PM1_GCD_BLOCK == 0 and math.gcd(g, n) > 1:
             break
-        while n % factor == 0:
-            if verbose is True:
-                st.write(f"{factor} ist ein weiterere Primfaktor.")
-            factors.append(factor)
-            n //= factor
+    return math.gcd(g, n)
+
+
+def pollard_pm1(n, trace=None, B1=PM1_B1, B2=None, base=2):
+    # divisor 1 < d < n of n or None. A prime p | n is found when p - 1 is B1-smooth up
+    # to one further prime below B2
+    if n % 2 == 0:
+        if trace is not None:
+            trace("Da {} eine gerade Zahl ist ist 2 ein Primfaktor", n)
+        return 2
+    B2 = B2 or PM1_B2_FACTOR * B1
+
+    a = pow(base, prime_power_product(B1), n)
+    d = math.gcd(a - 1, n)
+    if trace is not None:
+        trace("Stufe 1: {} hoch das Produkt aller Primzahlpotenzen bis B1 = {} ist {}, der ggT mit {} ist {}.", base, B1, a, n, d)
+    if d == n:
+        d = pm1_backtrack(n, base, B1)
+        if trace is not None:
+            trace("Da d = n ist, wird Stufe 1 Primzahl für Primzahl wiederholt, der ggT ist nun {}.", d)
+    if d == 1:
+        d = pm1_stage2(a, n, B1, B2)
+        if trace is not None:
+            trace("Stufe 2: Der ggT der Produkte für alle Primzahlen bis B2 = {} mit {} ist {}.", B2, n, d)
+    if 1 < d < n:
+        if trace is not None:
+            trace("Da der ggT ({}) größer 1, aber kleiner {} ist es ein Teiler.", d, n)
+        return d
+    return None
 
-    return factors
+
+def find_factor_pm1(n, trace=None, B1=PM1_B1, rounds=PM1_ROUNDS):
+    # pollard_pm1 with growing bounds, None if p - 1 is not smooth enough for any of
+    # the rounds
+    for _ in range(rounds):
+        d = pollard_pm1(n, trace, B1)
+        if d is not None:
+            return d
+        B1 *= 4
+    return None
+
+
+# ECM rounds as (B1, curves), about the GMP-ECM table for factors of 15, 20 and 25 digits
+ECM_SCHEDULE = ((2000, 25), (11_000, 90), (50_000, 300))
+# stage 2 of every curve goes up to ECM_B2_FACTOR * B1
+ECM_B2_FACTOR = 50
+
+
+def ecm_double(P, a24, n):
+    # 2P on By^2 = x^3 + Ax^2 + x in the coordinates (X : Z), a24 = (A + 2) / 4
+    X, Z = P
+    s, d = (X + Z) ** 2 % n, (X - Z) ** 2 % n
+    t = s - d
+    return s * d % n, t * (d + a24 * t) % n
+
+
+def ecm_add(P, Q, diff, n):
+    # P + Q from P, Q and P - Q, no y coordinate needed
+    u = (P[0] - P[1]) * (Q[0] + Q[1])
+    v = (P[0] + P[1]) * (Q[0] - Q[1])
+    return diff[1] * (u + v) ** 2 % n, diff[0] * (u - v) ** 2 % n
+
+
+def ecm_multiply(k, P, a24, n):
+    # kP for k >= 1, Montgomery ladder over (jP, (j + 1)P)
+    R0, R1 = P, ecm_double(P, a24, n)
+    for bit in bin(k)[3:]:
+        if bit == "1":
+            R0, R1 = ecm_add(R1, R0, P, n), ecm_double(R1, a24, n)
+        else:
+            R0, R1 = ecm_double(R0, a24, n), ecm_add(R0, R1, P, n)
+    return R0
 
 
-# ----------------------------------------STREAMLIT----------------------------------------
+def ecm_stage2(Q, a24, n, B1, B2):
+    # like williams_stage2: q = mD +- j and the x coordinates of mDQ and jQ agree
+    # mod p once the order of Q mod p divides q
+    D = WILLIAMS_D
+    Q2 = ecm_double(Q, a24, n)
+    baby = {1: Q, 3: ecm_add(Q2, Q, Q, n)}
+    for j in range(5, D // 2, 2):
+        baby[j] = ecm_add(baby[j - 2], Q2, baby[j - 4], n)
+    QD = ecm_multiply(D, Q, a24, n)
 
-"""st.header('Primzahlzerlegung')
+    def giant(m):
+        # mDQ, (1 : 0) is the point at infinity for m = 0
+        return ecm_multiply(m * D, Q, a24, n) if m > 0 else (1, 0)
 
-option = st.selectbox("Welche Primzahlzerlegungs-Methode soll gemacht werden?", ["Pollard-Rho", "Williams", "Lenstra", "Quadratischer Sieb"], index=0)
+    m = (B1 + 1 + D // 2) // D
+    previous, current = giant(max(m - 1, 0)), giant(m)
+    g = 1
+    # 2 is no j, Suyama's curves have it in every group order anyway
+    for q in primes(max(B1 + 1, 3), B2 + 1):
+        while q > m * D + D // 2:
+            m += 1
+            # the differential addition needs (m - 2)DQ away from infinity, below
+            # that the points are multiplied directly
+            previous, current = current, ecm_add(current, QD, previous, n) if m > 2 else giant(m)
+        X, Z = baby[abs(q - m * D)]
+        g = g * (current[0] * Z - X * current[1]) % n
+    return math.gcd(g, n)
 
-verbose = st.checkbox("Ist eine detailierte Beschreibung gewünscht?")
 
-number = st.number_input("Welche Zahl soll zerlegt werden?", value=1, min_value=1)
+def ecm(n, B1, curves, trace=None):
+    # Lenstra's method on Montgomery curves with Suyama's parametrisation, so every
+    # group order is divisible by 12. Divisor 1 < d < n of odd n or None
+    M = prime_power_product(B1)
+    B2 = ECM_B2_FACTOR * B1
+    for curve in range(curves):
+        sigma = random.randint(6, n - 1)
+        u, v = (sigma * sigma - 5) % n, 4 * sigma % n
+        denominator = 16 * pow(u, 3, n) * v % n
+        d = math.gcd(denominator, n)
+        if d == 1:
+            a24 = pow(v - u, 3, n) * (3 * u + v) * pow(denominator, -1, n) % n
+            X, Z = ecm_multiply(M, (pow(u, 3, n), pow(v, 3, n)), a24, n)
+            d = math.gcd(Z, n)
+            if d == 1:
+                d = ecm_stage2((X, Z), a24, n, B1, B2)
+        if trace is not None:
+            trace("ECM mit B1 = {}, Kurve {} mit sigma = {}: der ggT mit {} ist {}.", B1, curve + 1, sigma, n, d)
+        if 1 < d < n:
+            return d
+    return None
+
+
+def perfect_power(n):
+    # (root, k) with root^k = n for the smallest prime k, None if there is none
+    for k in small_primes(n.bit_length() + 1).tolist():
+        root = integer_root(n, k)
+        if root**k == n:
+            return root, k
+    return None
+
+
+def find_factor_any(n, trace=None):
+    # divisor of an odd composite n that is no perfect power. Word-size n go straight
+    # to rho, larger ones first try p-1, one rho walk with a budget and ECM with
+    # growing bounds, so rho without a budget only remains for hard balanced n
+    if n >= BATCH_LIMIT:
+        d = pollard_pm1(n, trace)
+        if d is None:
+            d = pollard_rho(n, trace, RHO_WALK_LIMIT)
+        for B1, curves in ECM_SCHEDULE:
+            if d is not None:
+                return d
+            d = ecm(n, B1, curves, trace)
+        if d is not None:
+            return d
+    return find_factor(n, trace)
+
 
-if option == "Pollard-Rho":
-    factors = factors_pollard(number, verbose)
-    st.write(f"Die Primfaktoren von {number} sind: ")
-    st.write(factors)
+def factorint(n, trace=None):
+    # {prime: multiplicity} of n >= 1. Small factors go with the primorial gcd, the
+    # cofactors are tested with the deterministic Miller-Rabin, roots are taken from
+    # perfect powers and everything else is split by find_factor_any
+    if n < 1:
+        raise ValueError("n must be at least 1")
+    small, n = small_factors(n)
+    if small and trace is not None:
+        trace("Die kleinen Primfaktoren {} werden mit einem ggT abgespalten.", small)
+    result = {}
+    for p in small:
+        result[p] = result.get(p, 0) + 1
 
-if option == "Williams":
-    factors = factors_williams(number, verbose)
-    st.write(f"Die Primfaktoren von {number} sind: ")
-    st.write(factors)"""
+    # cofactors with the multiplicity they carry
+    stack = [(n, 1)] if n > 1 else []
+    while stack:
+        m, k = stack.pop()
+        if millerrabin(m, 0, None, mode="deterministic"):
+            if trace is not None:
+                trace("{} ist ein Primfaktor", m)
+            result[m] = result.get(m, 0) + k
+            continue
+        power = perfect_power(m)
+        if power is not None:
+            if trace is not None:
+                trace("{} ist die {}-te Potenz von {}.", m, power[1], power[0])
+            stack.append((power[0], k * power[1]))
+            continue
+        d = find_factor_any(m, trace)
+        stack += [(d, k), (m // d, k)]
+    return dict(sorted(result.items()))
@@ -0,0 +1,81 @@
+import math
+
+from algorithmen.primzahltest import (
+    MILLERRABIN_BASES,
+    aks,
+    atkin,
+    bruteforce,
+    eratosthenes,
+    fermat,
+    millerrabin,
+    solovaystrassen,
+)
+
+# ----------------------------------------AUSWAHL----------------------------------------
+
+# seconds a single test may take before it is replaced by the automatic choice
+COST_BUDGET = 10.0
+
+
+def modexp_cost(number: int) -> float:
+    # one pow(a, e, number) with e about as large as number, fitted in CPython
+    return 2e-6 + 1e-11 * number.bit_length() ** 3
+
+
+# estimated seconds for a prime input (the worst case) per method, fitted on
+# measurements and rather too high than too low
+COST_MODELS = {
+    "bruteforce": lambda number, runden: 1e-7 * math.isqrt(number),
+    "eratosthenes": lambda number, runden: 3e-8 * math.isqrt(number),
+    "atkin": lambda number, runden: 3e-8 * number,
+    "fermat": lambda number, runden: number * modexp_cost(number),
+    "solovaystrassen": lambda number, runden: runden * modexp_cost(number),
+    "millerrabin": lambda number, runden: runden * modexp_cost(number),
+    "aks": lambda number, runden: 3.6 * (number.bit_length() / 20) ** 6,
+    # at most 13 fixed bases, beyond them BPSW costs about three modexps
+    "auto": lambda number, runden: len(MILLERRABIN_BASES[-1][1]) * modexp_cost(number),
+}
+
+
+def estimate_cost(method: str, number: int, runden: int = 5) -> float:
+    if method not in COST_MODELS:
+        raise NotImplementedError(f"Method {method} not implemented")
+    try:
+        return COST_MODELS[method](number, runden)
+    except OverflowError:
+        # numbers beyond the float range
+        return math.inf
+
+
+def select_method(method: str, number: int, runden: int = 5, budget: float = COST_BUDGET) -> str:
+    """The method that will actually run: "auto" replaces every choice whose
+    estimated cost is above the budget"""
+
+    if method != "auto" and estimate_cost(method, number, runden) > budget:
+        return "auto"
+    return method
+
+
+def primality_test(
+    number: int, method: str = "auto", runden: int = 5, trace=None, budget: float = COST_BUDGET
+) -> tuple[bool, str]:
+    """Runs the selected test, too expensive choices are downgraded to "auto"
+    (deterministic Miller-Rabin, special forms and BPSW beyond the fixed bases).
+    Returns (result, method that ran)"""
+
+    method = select_method(method, number, runden, budget)
+    if method == "bruteforce":
+        return bruteforce(number, trace), method
+    if method == "eratosthenes":
+        return eratosthenes(number, trace), method
+    if method == "atkin":
+        return atkin(number, trace), method
+    if method == "fermat":
+        return fermat(number, trace), method
+    if method == "solovaystrassen":
+        return solovaystrassen(number, runden, trace), method
+    if method == "millerrabin":
+        return millerrabin(number, runden, trace), method
+    if method == "aks":
+        return aks(number), method
+    return millerrabin(number, 0, trace, mode="deterministic"), method
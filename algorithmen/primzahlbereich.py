@@ -0,0 +1,134 @@
+import collections
+import concurrent.futures
+import math
+import os
+from multiprocessing import shared_memory
+from typing import Iterator
+
+import numpy as np
+
+from algorithmen.primzahltest import sieve_segment, small_primes
+
+# ----------------------------------------PRIMZAHLBEREICH----------------------------------------
+
+# odd numbers per task, 2^22 of them are a few milliseconds of sieving and 4 MiB
+RANGE_SEGMENT = 1 << 22
+# results are int64 arrays
+RANGE_LIMIT = 1 << 63
+
+# base primes of the current worker process, a view into the shared block that
+# stays attached for the life of the worker, so only one copy of the base exists
+worker_memory = None
+worker_base = None
+
+
+def init_worker(name: str, count: int) -> None:
+    global worker_memory, worker_base
+    worker_memory = shared_memory.SharedMemory(name=name)
+    worker_base = np.ndarray(count, dtype=np.int64, buffer=worker_memory.buf)
+
+
+def sieve_task(low: int, size: int, base: list | np.ndarray = None) -> np.ndarray:
+    segment = sieve_segment(low, size, worker_base if base is None else base)
+    return low + 2 * np.flatnonzero(segment)
+
+
+def segments(a: int, b: int) -> Iterator[tuple[int, int]]:
+    low = max(a, 3) | 1
+    while low <= b:
+        size = min(RANGE_SEGMENT, (b - low) // 2 + 1)
+        yield low, size
+        low += 2 * size
+
+
+def primes_in_range(a: int, b: int, workers: int = None) -> Iterator[np.ndarray]:
+    """All primes a <= p <= b as int64 arrays, one per segment and in order.
+    The segments are sieved in a process pool that reads the base primes
+    from shared memory, at most two segments per worker are in flight"""
+
+    if b >= RANGE_LIMIT:
+        raise ValueError(f"{b} is larger than the range limit {RANGE_LIMIT - 1}")
+    if a <= 2 <= b:
+        yield np.array([2], dtype=np.int64)
+    if b < 3:
+        return
+
+    base = small_primes(math.isqrt(b) + 1)[1:]
+    workers = workers or os.cpu_count()
+    if workers == 1 or b - a < 2 * RANGE_SEGMENT:
+        base = base.tolist()
+        for low, size in segments(a, b):
+            yield sieve_task(low, size, base)
+        return
+
+    memory = shared_memory.SharedMemory(create=True, size=max(base.nbytes, 1))
+    try:
+        np.ndarray(len(base), dtype=np.int64, buffer=memory.buf)[:] = base
+        with concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=init_worker, initargs=(memory.name, len(base))
+        ) as executor:
+            pending = collections.deque()
+            for low, size in segments(a, b):
+                pending.append(executor.submit(sieve_task, low, size))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+# ----------------------------------------ZERLEGUNG----------------------------------------
+
+# numbers per segment of factor_range, the work arrays stay at a few MiB
+FACTOR_SEGMENT = 1 << 20
+
+
+def factor_range(a: int, b: int) -> Iterator[tuple[int, np.ndarray, np.ndarray]]:
+    """Complete factorizations of all a <= n <= b, one segment at a time. Every base
+    prime up to the root of b is divided out along its stride, what is left is 1 or
+    prime. Yields (low, index, factors): factors[j] divides low + index[j], sorted by
+    index and ascending per number, with multiplicity"""
+
+    if a < 1:
+        raise ValueError("a must be at least 1")
+    if b >= RANGE_LIMIT:
+        raise ValueError(f"{b} is larger than the range limit {RANGE_LIMIT - 1}")
+
+    base = small_primes(math.isqrt(b) + 1)
+    # primes above the segment length hit a segment at most once, they go in one batch
+    split = int(np.searchsorted(base, FACTOR_SEGMENT))
+    small, large = base[:split].tolist(), base[split:]
+
+    for low in range(a, b + 1, FACTOR_SEGMENT):
+        size = min(FACTOR_SEGMENT, b + 1 - low)
+        rest = np.arange(low, low + size, dtype=np.int64)
+        index, factors = [], []
+
+        for p in small:
+            idx = np.arange(-low % p, size, p)
+            while len(idx):
+                index.append(idx)
+                factors.append(np.full(len(idx), p, dtype=np.int64))
+                rest[idx] //= p
+                idx = idx[rest[idx] % p == 0]
+
+        start = -low % large
+        hit = start < size
+        idx, p = start[hit], large[hit]
+        while len(idx):
+            index.append(idx)
+            factors.append(p)
+            # one number can have several large prime factors, ufunc.at applies all of them
+            np.floor_divide.at(rest, idx, p)
+            again = rest[idx] % p == 0
+            idx, p = idx[again], p[again]
+
+        left = np.flatnonzero(rest > 1)
+        index.append(left)
+        factors.append(rest[left])
+
+        index, factors = np.concatenate(index), np.concatenate(factors)
+        order = np.lexsort((factors, index))
+        yield low, index[order], factors[order]
@@ -0,0 +1,227 @@
+import functools
+import math
+import os
+import tempfile
+
+import numpy as np
+
+from algorithmen.primzahltest import sieve_segment, small_primes
+
+# ----------------------------------------PRIMZAHLTABELLE----------------------------------------
+
+# residues mod 30 that are coprime to 30, bit i of byte k stands for 30k + WHEEL[i]
+WHEEL = np.array([1, 7, 11, 13, 17, 19, 23, 29], dtype=np.int64)
+WHEEL_BIT = {int(r): i for i, r in enumerate(WHEEL)}
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+MAGIC = b"PRIM30\x00\x00"
+HEADER = 16
+# bytes sieved per step while writing, 65536 bytes cover about 2 million numbers
+WRITE_BLOCK = 1 << 16
+# bytes per entry of the popcount prefix used by nth_prime
+COUNT_BLOCK = 1 << 12
+
+PRIME_TABLE_LIMIT = 10**7
+PRIME_TABLE_PATH = os.environ.get(
+    "PRIME_TABLE_PATH", os.path.join(tempfile.gettempdir(), "prime_table_wheel30.bin")
+)
+
+
+def write_prime_table(path: str, limit: int) -> None:
+    """Writes the wheel-30 bitmap of all primes up to limit, 8 bits per 30 numbers.
+    The file is written next to path and renamed, readers never see a partial table"""
+
+    n_bytes = limit // 30 + 1
+    base = small_primes(math.isqrt(30 * n_bytes) + 1)[1:].tolist()
+    offsets = (WHEEL - 1) // 2
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as file:
+        file.write(MAGIC + limit.to_bytes(8, "little"))
+        for k in range(0, n_bytes, WRITE_BLOCK):
+            count = min(WRITE_BLOCK, n_bytes - k)
+            # odd numbers 30k + 1 ... 30(k + count) - 1
+            segment = sieve_segment(30 * k + 1, 15 * count, base)
+            bits = segment.reshape(count, 15)[:, offsets]
+            if k == 0:
+                bits[0, 0] = False
+            numbers = 30 * (k + np.arange(count))[:, None] + WHEEL
+            bits &= numbers <= limit
+            file.write(np.packbits(bits, axis=1, bitorder="little").tobytes())
+    os.replace(tmp, path)
+
+
+class PrimeTable:
+    """Read-only memory mapped wheel-30 prime bitmap. All processes that open the
+    same file share one copy of it in the page cache"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            header = file.read(HEADER)
+        if header[:8] != MAGIC:
+            raise ValueError(f"{path} is not a prime table")
+        self.path = path
+        self.limit = int.from_bytes(header[8:], "little")
+        self.bits = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER)
+        self.counts = None
+
+    def is_small_prime(self, n: int) -> bool:
+        if n > self.limit:
+            raise ValueError(f"{n} is larger than the table limit {self.limit}")
+        if n < 7:
+            return n in (2, 3, 5)
+        bit = WHEEL_BIT.get(n % 30)
+        return bit is not None and bool(self.bits[n // 30] >> bit & 1)
+
+    def primes_between(self, lo: int, hi: int) -> np.ndarray:
+        """All primes lo <= p < hi as int64 array"""
+
+        if hi - 1 > self.limit:
+            raise ValueError(f"{hi - 1} is larger than the table limit {self.limit}")
+        lo = max(lo, 0)
+        if lo >= hi:
+            return np.array([], dtype=np.int64)
+
+        first, last = lo // 30, (hi - 1) // 30 + 1
+        bits = np.unpackbits(self.bits[first:last], bitorder="little").reshape(-1, 8)
+        rows, cols = np.nonzero(bits)
+        found = 30 * (first + rows) + WHEEL[cols]
+        wheel_primes = np.array([p for p in (2, 3, 5) if lo <= p < hi], dtype=np.int64)
+        return np.concatenate((wheel_primes, found[(found >= lo) & (found < hi)]))
+
+    def nth_prime(self, k: int) -> int:
+        """k-th prime, counting from nth_prime(1) = 2"""
+
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        if k <= 3:
+            return (2, 3, 5)[k - 1]
+
+        if self.counts is None:
+            blocks = np.add.reduceat(
+                POPCOUNT[self.bits], np.arange(0, len(self.bits), COUNT_BLOCK), dtype=np.int64
+            )
+            self.counts = np.cumsum(blocks)
+        k -= 3
+        block = int(np.searchsorted(self.counts, k))
+        if block >= len(self.counts):
+            raise IndexError(f"the table up to {self.limit} holds fewer than {k + 3} primes")
+
+        before = int(self.counts[block - 1]) if block else 0
+        start = block * COUNT_BLOCK
+        bits = np.unpackbits(self.bits[start : start + COUNT_BLOCK], bitorder="little")
+        rows, cols = np.nonzero(bits.reshape(-1, 8))
+        i = k - before - 1
+        return int(30 * (start + rows[i]) + WHEEL[cols[i]])
+
+
+@functools.lru_cache()
+def open_prime_table(path: str, mtime: float) -> PrimeTable:
+    return PrimeTable(path)
+
+
+def prime_table(limit: int = PRIME_TABLE_LIMIT, path: str = PRIME_TABLE_PATH) -> PrimeTable:
+    """Shared prime table covering at least limit, written on first use"""
+
+    if os.path.exists(path):
+        table = open_prime_table(path, os.path.getmtime(path))
+        if table.limit >= limit:
+            return table
+    write_prime_table(path, max(limit, PRIME_TABLE_LIMIT))
+    return open_prime_table(path, os.path.getmtime(path))
+
+
+# ----------------------------------------SPF----------------------------------------
+
+SPF_MAGIC = b"SPF32\x00\x00\x00"
+SPF_TABLE_LIMIT = 10**8
+SPF_TABLE_PATH = os.environ.get(
+    "SPF_TABLE_PATH", os.path.join(tempfile.gettempdir(), "spf_table_odd.bin")
+)
+
+
+def write_spf_table(path: str, limit: int) -> None:
+    """Writes the smallest prime factor of every odd number up to limit as uint32,
+    entry i belongs to 2i + 1. Sieved straight into the memory mapped file, the
+    primes in ascending order only fill entries that are still empty"""
+
+    size = limit // 2 + 1
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as file:
+        file.write(SPF_MAGIC + limit.to_bytes(8, "little"))
+    spf = np.memmap(tmp, dtype=np.uint32, mode="r+", offset=HEADER, shape=(size,))
+    spf[0] = 1
+    for p in small_primes(math.isqrt(2 * size - 1) + 1)[1:].tolist():
+        if spf[p // 2] != 0:
+            continue
+        view = spf[p * p // 2 :: p]
+        view[view == 0] = p
+    # what is left has no factor up to the root, the entry is the number itself
+    free = np.flatnonzero(spf == 0)
+    spf[free] = 2 * free + 1
+    spf.flush()
+    del spf
+    os.replace(tmp, path)
+
+
+class SpfTable:
+    """Read-only memory mapped smallest prime factor table over the odd numbers"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            header = file.read(HEADER)
+        if header[:8] != SPF_MAGIC:
+            raise ValueError(f"{path} is not a smallest prime factor table")
+        self.path = path
+        self.limit = int.from_bytes(header[8:], "little")
+        self.spf = np.memmap(path, dtype=np.uint32, mode="r", offset=HEADER)
+
+    def factor_many(self, numbers: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Factors all 0 < n <= limit at once, one vectorised lookup per prime factor.
+        Returns (index, factors): factors[j] divides numbers[index[j]], sorted by
+        index and ascending per number, with multiplicity"""
+
+        n = np.asarray(numbers, dtype=np.int64).ravel()
+        if len(n) and (n.min() < 1 or n.max() > self.limit):
+            raise ValueError(f"numbers must lie in 1 ... {self.limit}")
+
+        lanes = np.arange(len(n))
+        lanes, n = lanes[n > 1], n[n > 1]
+        index, factors = [], []
+        while len(n):
+            p = np.where(n & 1, self.spf[n >> 1], 2).astype(np.int64)
+            index.append(lanes)
+            factors.append(p)
+            n = n // p
+            lanes, n = lanes[n > 1], n[n > 1]
+
+        if not index:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        index, factors = np.concatenate(index), np.concatenate(factors)
+        # factors of a number come out in ascending order, a stable sort keeps it
+        order = np.argsort(index, kind="stable")
+        return index[order], factors[order]
+
+
+@functools.lru_cache()
+def open_spf_table(path: str, mtime: float) -> SpfTable:
+    return SpfTable(path)
+
+
+def spf_table(limit: int = SPF_TABLE_LIMIT, path: str = SPF_TABLE_PATH) -> SpfTable:
+    """Shared smallest prime factor table covering at least limit, written on first use"""
+
+    if os.path.exists(path):
+        table = open_spf_table(path, os.path.getmtime(path))
+        if table.limit >= limit:
+            return table
+    write_spf_table(path, max(limit, SPF_TABLE_LIMIT))
+    return open_spf_table(path, os.path.getmtime(path))
+
+
+def factor_small_many(numbers: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Factorizations of many integers up to SPF_TABLE_LIMIT, see SpfTable.factor_many"""
+
+    numbers = np.asarray(numbers)
+    limit = int(numbers.max()) if numbers.size else 1
+    return spf_table(limit).factor_many(numbers)
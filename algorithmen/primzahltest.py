@@ -1,89 +1,370 @@
+import functools
 import math
 import random
 
-import streamlit as st
+import numpy as np
 
 # ----------------------------------------PRIMZAHLTEST----------------------------------------
 
 
-def bruteforce(number, verbose):
+def bruteforce(number, trace=None):
     if number == 1:
         return False
-    for i in range(2, int((number ** (1 / 2)) + 1)):
+    start = 2
+    if trace is None and number >= PRIMORIAL_LIMIT:
+        # without a description all divisors below PRIMORIAL_LIMIT cost one gcd
+        if math.gcd(number, primorial()) > 1:
+            return False
+        start = PRIMORIAL_LIMIT
+    for i in range(start, math.isqrt(number) + 1):
         if number % i == 0:
-            if verbose is True:
-                st.text(f"{i} ist ein echter Teiler von {number}.")
-                st.text(f"Die Zahl {number} ist zusammengesetzt.")
-                st.text(f"{number} = {i} * {number // i}")
+            if trace is not None:
+                trace("{} ist ein echter Teiler von {}.", i, number)
+                trace("Die Zahl {} ist zusammengesetzt.", number)
+                trace("{} = {} * {}", number, i, number // i)
             return False
         else:
-            if verbose is True:
-                st.text(f"{i} ist kein Teiler von {number}")
+            if trace is not None:
+                trace("{} ist kein Teiler von {}", i, number)
     return True
 
 
-def eratosthenes(number, verbose):
-    primes = []
+# odd numbers per sieve segment, 256 KiB fit into the L2 cache
+SIEVE_SEGMENT = 1 << 18
+# primes below this bound are split off with one gcd against their product
+PRIMORIAL_LIMIT = 1 << 12
+
+
+def small_primes(limit):
+    # all primes below limit, plain sieve over the odd numbers (index i -> 2i + 1)
+    if limit <= 2:
+        return np.array([], dtype=np.int64)
+    sieve = np.ones(limit // 2, dtype=bool)
+    sieve[0] = False
+    for i in range(1, math.isqrt(limit - 1) // 2 + 1):
+        if sieve[i]:
+            p = 2 * i + 1
+            sieve[p * p // 2 :: p] = False
+    return np.concatenate(([2], 2 * np.flatnonzero(sieve) + 1))
+
+
+def primes(lo, hi):
+    # yields all primes lo <= p < hi, memory is bounded by SIEVE_SEGMENT
+    lo = max(lo, 2)
+    if lo >= hi:
+        return
+    if lo == 2:
+        yield 2
+    base = small_primes(math.isqrt(hi - 1) + 1)[1:].tolist()
+
+    low = lo | 1
+    while low < hi:
+        size = min(SIEVE_SEGMENT, (hi - low + 1) // 2)
+        segment = sieve_segment(low, size, base)
+        yield from [low + 2 * i for i in np.flatnonzero(segment).tolist()]
+        low += 2 * size
+
+
+def sieve_segment(low, size, base):
+    # marks the odd numbers low, low + 2, ... that have no factor in the odd base
+    # primes, which must reach up to the root of low + 2 * size
+    high = low + 2 * size
+    segment = np.ones(size, dtype=bool)
+    # base may be an int64 array, python ints keep the index arithmetic exact
+    for p in map(int, base):
+        if p * p >= high:
+            break
+        start = max(p * p, (low + p - 1) // p * p)
+        if start % 2 == 0:
+            start += p
+        segment[(start - low) // 2 :: p] = False
+    return segment
+
+
+def product_tree(values):
+    # tree[0] are the values, every level above holds the products of pairs
+    tree = [list(values)]
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        tree.append([math.prod(level[i : i + 2]) for i in range(0, len(level), 2)])
+    return tree
+
+
+def remainder_tree(number, tree):
+    # number mod every leaf of a product tree, reduced from the root downwards
+    rest = [number % tree[-1][0]]
+    for level in reversed(tree[:-1]):
+        rest = [rest[i // 2] % value for i, value in enumerate(level)]
+    return rest
+
+
+@functools.lru_cache()
+def primorial_tree():
+    # product tree of the primes below PRIMORIAL_LIMIT, the root is their primorial
+    return product_tree(small_primes(PRIMORIAL_LIMIT).tolist())
+
+
+def primorial():
+    return primorial_tree()[-1][0]
+
+
+def small_factors(number):
+    # prime factors of number > 0 below PRIMORIAL_LIMIT and the cofactor, one gcd
+    # with the primorial settles most numbers and the tree is only walked below it
+    tree = primorial_tree()
+    g = math.gcd(number, tree[-1][0])
+    factors = []
+    if g == 1:
+        return factors, number
+    nodes = [0]
+    for level in reversed(tree[:-1]):
+        children = (j for i in nodes for j in (2 * i, 2 * i + 1) if j < len(level))
+        nodes = [j for j in children if math.gcd(g, level[j]) > 1]
+    for p in (tree[0][i] for i in nodes):
+        while number % p == 0:
+            factors.append(p)
+            number //= p
+    return factors, number
+
+
+def primorial_gcds(numbers):
+    # gcd of every number with the primorial, the primorial is reduced down the
+    # product tree of the batch instead of a separate big gcd per number
+    numbers = list(numbers)
+    if not numbers:
+        return []
+    rest = remainder_tree(primorial(), product_tree(numbers))
+    return [math.gcd(r, n) for r, n in zip(rest, numbers)]
+
+
+def prime_pi(x):
+    # number of primes <= x with Lucy_Hedgehog's method in numpy: small[v] = S(v) and
+    # large[i] = S(x // i) for v, i <= sqrt(x), O(x^(3/4)) time and O(sqrt(x)) memory
+    if x < 2:
+        return 0
+    r = math.isqrt(x)
+    small = np.arange(-1, r, dtype=np.int64)
+    # quotients[i] = x // i, so x // (i * p) = quotients[i] // p is a division by a scalar
+    quotients = np.zeros(r + 1, dtype=np.int64)
+    quotients[1:] = x // np.arange(1, r + 1, dtype=np.int64)
+    large = quotients - 1
+
+    # S(v) -= S(v // p) - S(p - 1) for all v >= p^2, right-hand sides use the old values
+    for p in small_primes(r + 1).tolist():
+        sp = int(small[p - 1])
+        stop = min(r, x // (p * p))
+        mid = min(stop, r // p)
+        large[1 : mid + 1] -= large[p : mid * p + 1 : p] - sp
+        if stop > mid:
+            large[mid + 1 : stop + 1] -= small[quotients[mid + 1 : stop + 1] // p] - sp
+        if p * p <= r:
+            # v // p for v = p^2 ... r runs through p ... r // p, each value p times
+            small[p * p :] -= np.repeat(small[p : r // p + 1], p)[: r + 1 - p * p] - sp
+    return int(large[1])
+
+
+def nth_prime(k):
+    # k-th prime (nth_prime(1) = 2): prime_pi at an estimate, then a sieve window
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    if k < 6:
+        return (2, 3, 5, 7, 11)[k - 1]
+    log_k = math.log(k)
+    estimate = int(k * (log_k + math.log(log_k) - 1 + (math.log(log_k) - 2) / log_k))
+    count = prime_pi(estimate)
+    window = max(int(log_k) * 1024, 1 << 16)
+
+    lo = estimate + 1
+    while count < k:
+        found = list(primes(lo, lo + window))
+        if count + len(found) >= k:
+            return found[k - count - 1]
+        count += len(found)
+        lo += window
+
+    hi = estimate + 1
+    while True:
+        found = list(primes(max(hi - window, 2), hi))
+        if count - len(found) < k:
+            return found[k - count + len(found) - 1]
+        count -= len(found)
+        hi -= window
+
+
+# bound on the base primes for the windows of next_prime / prev_prime / prime_gaps,
+# about 90% of the odd numbers have a factor below it and never reach the strong test
+PRIME_WINDOW_SIEVE = 1 << 16
+
+
+def window_size(number):
+    # odd numbers per window, a few expected prime gaps around number
+    return max(1 << 6, 2 * number.bit_length())
+
+
+def window_base(number):
+    # the strong test is cheap for small numbers, the sieve bound grows with bits^2
+    bound = min(PRIME_WINDOW_SIEVE, max(1 << 6, number.bit_length() ** 2 // 8))
+    return small_primes(bound)[1:].tolist()
+
+
+def window_primes(low, size, base, reverse=False):
+    # primes among the odd numbers low, low + 2, ..., low + 2(size - 1) with low >= 3,
+    # only the survivors of the sieve by the base primes run the strong test
+    segment = sieve_segment(low, size, base)
+    candidates = [low + 2 * i for i in np.flatnonzero(segment).tolist()]
+    if reverse:
+        candidates.reverse()
+    # survivors are prime if the base reaches up to the root of the window
+    proven = low + 2 * size <= base[-1] ** 2
+    for candidate in candidates:
+        if proven or millerrabin(candidate, 0, None, mode="deterministic"):
+            yield candidate
+
+
+def next_prime(number):
+    # smallest prime > number
+    if number < 2:
+        return 2
+    base = window_base(number)
+    low, size = (number + 1) | 1, window_size(number)
+    while True:
+        for candidate in window_primes(low, size, base):
+            return candidate
+        low += 2 * size
+
+
+def prev_prime(number):
+    # largest prime < number
+    if number <= 2:
+        raise ValueError(f"there is no prime below {number}")
+    base = window_base(number)
+    high, size = (number - 2) | 1, window_size(number)
+    while high >= 3:
+        low = max(high - 2 * (size - 1), 3)
+        for candidate in window_primes(low, (high - low) // 2 + 1, base, reverse=True):
+            return candidate
+        high = low - 2
+    return 2
+
+
+def prime_gaps(lo, hi):
+    # yields (p, q - p) for all consecutive primes lo <= p < q < hi
+    # a whole range pays for the full base, below 2^32 it makes the sieve exact
+    base = small_primes(min(PRIME_WINDOW_SIEVE, math.isqrt(hi) + 4))[1:].tolist()
+    previous = 2 if lo <= 2 else None
+
+    low = max(lo, 3) | 1
+    while low < hi:
+        count = min(SIEVE_SEGMENT, (hi - low + 1) // 2)
+        for q in window_primes(low, count, base):
+            if previous is not None:
+                yield previous, q - previous
+            previous = q
+        low += 2 * count
+
+
+def eratosthenes(number, trace=None):
+    found = []
     if number == 1:
         return False
-    for i in range(2, number):
-        if bruteforce(i, 0) == 1:
-            primes.append(i)
-            if verbose is True:
-                st.write(f"{i} ist die nächte Primzahl.")
-            if number % i == 0:
-                if verbose is True:
-                    st.write(f"Die Primzahl {i} ist ein echter Teiler von {number}.")
-                    st.write(f"Die Zahl {number} ist zusammengesetzt.")
-                    st.write(f"{number} = {i} * {number // i}")
-                return False
-            else:
-                if verbose is True:
-                    st.write(f"Aber {i} ist kein Teiler von {number}.")
-    if verbose is True:
-        st.write(f"Alle Primzahlen bis {number} lauten: {primes}")
+    limit = math.isqrt(number)
+    for i in primes(2, limit + 1):
+        if trace is not None:
+            found.append(i)
+            trace("{} ist die nächte Primzahl.", i)
+        if number % i == 0:
+            if trace is not None:
+                trace("Die Primzahl {} ist ein echter Teiler von {}.", i, number)
+                trace("Die Zahl {} ist zusammengesetzt.", number)
+                trace("{} = {} * {}", number, i, number // i)
+            return False
+        else:
+            if trace is not None:
+                trace("Aber {} ist kein Teiler von {}.", i, number)
+    if trace is not None:
+        trace("Alle Primzahlen bis {} lauten: {}", limit, found)
     return True
 
 
-def atkin(number, verbose):
-    if verbose is True:
-        st.write(
+# residues mod 60 for which the three quadratic forms toggle a candidate
+ATKIN_FORMS = (
+    (1, 13, 17, 29, 37, 41, 49, 53),
+    (7, 19, 31, 43),
+    (11, 23, 47, 59),
+)
+
+
+def atkin_sieve(limit):
+    # packed bitmap over the odd numbers up to limit, bit i stands for 2i + 1
+    sieve = np.zeros(limit // 2 + 1, dtype=bool)
+    masks = np.zeros((3, 60), dtype=bool)
+    for form, residues in enumerate(ATKIN_FORMS):
+        masks[form, list(residues)] = True
+    y2 = np.arange(1, math.isqrt(limit) + 1, dtype=np.int64) ** 2
+
+    # every row of the x/y lattice holds distinct n, so each toggle is one xor
+    for x in range(1, math.isqrt(limit // 2) + 2):
+        x2 = x * x
+        if 4 * x2 < limit:
+            n = 4 * x2 + y2[: math.isqrt(limit - 4 * x2)]
+            n = n[masks[0, n % 60]]
+            sieve[n >> 1] ^= True
+        if 3 * x2 < limit:
+            n = 3 * x2 + y2[: math.isqrt(limit - 3 * x2)]
+            n = n[masks[1, n % 60]]
+            sieve[n >> 1] ^= True
+        y_lo = math.isqrt(3 * x2 - limit - 1) + 1 if 3 * x2 > limit else 1
+        if y_lo < x:
+            n = 3 * x2 - y2[y_lo - 1 : x - 1]
+            n = n[masks[2, n % 60]]
+            sieve[n >> 1] ^= True
+
+    # remove numbers with square factors
+    for i in range(3, math.isqrt(limit) // 2 + 1):
+        if sieve[i]:
+            p = 2 * i + 1
+            sieve[p * p >> 1 :: p * p] = False
+
+    # 3 and 5 are not covered by the mod 60 forms
+    for p in (3, 5):
+        if p <= limit:
+            sieve[p >> 1] = True
+    return np.packbits(sieve, bitorder="little")
+
+
+def bitmap_contains(bitmap, number):
+    # O(1) lookup in a bitmap from atkin_sieve
+    if number < 3 or number % 2 == 0:
+        return number == 2
+    i = number >> 1
+    if i >> 3 >= len(bitmap):
+        return False
+    return bool(bitmap[i >> 3] >> (i & 7) & 1)
+
+
+def bitmap_primes(bitmap, limit):
+    odd = 2 * np.flatnonzero(np.unpackbits(bitmap, bitorder="little")) + 1
+    return ([2] if limit >= 2 else []) + odd[odd <= limit].tolist()
+
+
+def atkin(number, trace=None):
+    if trace is not None:
+        trace(
             "Die Modulo-Bedingungen sehen wie folgt aus: \n"
             "1. x^2 + y^2 = n    (mod 60) wobei n % 60 in (1, 13, 17, 29, 37, 41, 49, 53) enthalten sein muss. \n"
             "2. x^2 + 3y^2 = n   (mod 60) wobei n % 60 is in (7, 19, 31, 43) enthalten sein muss. \n"
             "3. 3x^2 - y^2 = n   (mod 60) wobei n % 60 is in (11, 23, 47, 59) enthalten sein muss. \n"
         )
-    sieve = [False] * (number + 1)
-    sqrt_limit = int(math.sqrt(number)) + 1
-
-    for x in range(1, sqrt_limit):
-        for y in range(1, sqrt_limit):
-            n = 4 * x**2 + y**2
-            if n <= number and n % 60 in {1, 13, 17, 29, 37, 41, 49, 53}:
-                sieve[n] = not sieve[n]
-            n = 3 * x**2 + y**2
-            if n <= number and n % 60 in {7, 19, 31, 43}:
-                sieve[n] = not sieve[n]
-            n = 3 * x**2 - y**2
-            if x > y and n <= number and n % 60 in {11, 23, 47, 59}:
-                sieve[n] = not sieve[n]
-
-    for n in range(5, sqrt_limit):
-        if sieve[n]:
-            for k in range(n**2, number + 1, n**2):
-                sieve[k] = False
-
-    primes = [2, 3] if number > 2 else []
-    primes += [n for n in range(5, number + 1) if sieve[n]]
-    if verbose is True:
-        st.write(f"Alle Primzahlen bis {number} lauten: {primes}")
-    if number in primes:
-        if verbose is True:
-            st.write(f"Die Zahl {number} kommt im Array vor.")
+    bitmap = atkin_sieve(number)
+    if trace is not None:
+        trace("Alle Primzahlen bis {} lauten: {}", number, bitmap_primes(bitmap, number))
+    if bitmap_contains(bitmap, number):
+        if trace is not None:
+            trace("Die Zahl {} kommt im Array vor.", number)
         return True
     else:
-        if verbose is True:
-            st.write(f"Die Zahl {number} kommt nicht im Array vor.")
+        if trace is not None:
+            trace("Die Zahl {} kommt nicht im Array vor.", number)
         return False
 
 
@@ -93,307 +374,573 @@ def ggt(a, b):
     return ggt(b, a % b)
 
 
-def fermat(number, verbose):
+def fermat(number, trace=None):
     if number == 1:
         return False
     for i in range(2, number):
         nggt = ggt(number, i)
-        if verbose is True:
-            st.write(f"Bestimmung von ggT von {number} und {i} = {nggt}")
+        if trace is not None:
+            trace("Bestimmung von ggT von {} und {} = {}", number, i, nggt)
         if nggt == 1:
-            if verbose is True:
-                latex = rf"{i}^{{{number - 1}}} mod {number}"
-                st.write(
-                    f"Da der größte gemeinsame Teiler gleich 1 ist, wird ${latex}$ berechnet."
+            if trace is not None:
+                trace(
+                    "Da der größte gemeinsame Teiler gleich 1 ist, wird ${}^{{{}}} mod {}$ berechnet.",
+                    i,
+                    number - 1,
+                    number,
                 )
-            if ((i ** (number - 1)) % number) != 1:
-                if verbose is True:
-                    latex = rf"{i}^{{{number - 1}}} mod {number}"
-                    st.write(f"Da ${latex}$ gleich 1 ist folgt draus:")
-                    st.write(f"Die Zahl {number} ist zusammengesetzt.")
+            if pow(i, number - 1, number) != 1:
+                if trace is not None:
+                    trace("Da ${}^{{{}}} mod {}$ gleich 1 ist folgt draus:", i, number - 1, number)
+                    trace("Die Zahl {} ist zusammengesetzt.", number)
                 return False
-    if verbose is True:
-        st.write(
-            f"Es wurden alle Zahlen von 2 bis {number - 1} probiert und da kein Zerlegung gefunden wurde folgt:"
+    if trace is not None:
+        trace(
+            "Es wurden alle Zahlen von 2 bis {} probiert und da kein Zerlegung gefunden wurde folgt:",
+            number - 1,
         )
-        st.write(
-            f"Die Zahl {number} scheint eine Primzahl zu sein, aber es könnte sich auch um eine Carmichael-Zahl handeln."
+        trace(
+            "Die Zahl {} scheint eine Primzahl zu sein, aber es könnte sich auch um eine Carmichael-Zahl handeln.",
+            number,
         )
     return True
 
 
-def legendre(a, n):
-    if a == 0:
-        return 0
-    if a == 1:
-        return 1
-    if a % 2 == 0:
-        if n % 8 == 1 or n % 8 == 7:
-            return legendre(a // 2, n)
-        else:
-            return -legendre(a // 2, n)
-    if a % 4 == 3 and n % 4 == 3:
-        return -legendre(n % a, a)
-    else:
-        return legendre(n % a, a)
-
-
-def solovaystrassen(number, k, verbose):
+def jacobi(a, n):
+    # Jacobi symbol (a/n) for odd n > 0, iterative binary algorithm
+    a %= n
+    result = 1
+    while a:
+        # (2/n) = -1 exactly for n = 3, 5 mod 8
+        twos = (a & -a).bit_length() - 1
+        a >>= twos
+        if twos % 2 and n % 8 in (3, 5):
+            result = -result
+        # quadratic reciprocity
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a, n = n % a, a
+    return result if n == 1 else 0
+
+
+def lucas_sequence(k, P, Q, n):
+    # U_k, V_k and Q^k mod odd n for the Lucas sequences of x^2 - Px + Q,
+    # left-to-right with the doubling formulas
+    D = P * P - 4 * Q
+    if k == 0:
+        return 0, 2 % n, 1 % n
+
+    def half(x):
+        return (x + n if x % 2 else x) // 2 % n
+
+    U, V, Qk = 1, P % n, Q % n
+    for bit in bin(k)[3:]:
+        U, V, Qk = U * V % n, (V * V - 2 * Qk) % n, Qk * Qk % n
+        if bit == "1":
+            U, V = half(P * U + V), half(D * U + P * V)
+            Qk = Qk * Q % n
+    return U, V, Qk
+
+
+def solovaystrassen(number, k, trace=None):
     if number < 2:
-        if verbose is True:
-            st.write(f"Die Zahl {number} ist kleiner 2.")
+        if trace is not None:
+            trace("Die Zahl {} ist kleiner 2.", number)
         return False
-    if number != 2 and number % 2 == 0:
-        if verbose is True:
-            st.write(f"Die Zahl {number} ist zusammengesetzt.")
-            st.write(f"weil die Zahl {number} ist gerade ist.")
+    if number == 2:
+        return True
+    if number % 2 == 0:
+        if trace is not None:
+            trace("Die Zahl {} ist zusammengesetzt.", number)
+            trace("weil die Zahl {} ist gerade ist.", number)
         return False
     for _ in range(k):
         a = random.randint(2, number - 1)
-        if verbose is True:
-            st.write(
-                f"Es wurde eine Zufallszahl {a} zwischen 2 und {number - 1} generiert."
-            )
-        x = legendre(a, number)
-        if verbose is True:
-            st.write(
-                f"Mit dieser Zufallszahl {a} wurde des Legendre-Symbol {x} berechnet."
-            )
+        if trace is not None:
+            trace("Es wurde eine Zufallszahl {} zwischen 2 und {} generiert.", a, number - 1)
+        x = jacobi(a, number)
+        if trace is not None:
+            trace("Mit dieser Zufallszahl {} wurde des Jacobi-Symbol {} berechnet.", a, x)
         if x == 0 or pow(a, (number - 1) // 2, number) != (x % number):
-            if verbose is True:
-                latex = rf"{a}^{{{((number - 1) / 2)}}} \equiv {x} mod {number}"
-                st.write(f"Da ${latex}$, folgt daraus:")
-                st.write(f"Die Zahl {number} ist zusammengesetzt.")
+            if trace is not None:
+                trace(
+                    r"Da ${}^{{{}}} \equiv {} mod {}$, folgt daraus:",
+                    a,
+                    (number - 1) // 2,
+                    x,
+                    number,
+                )
+                trace("Die Zahl {} ist zusammengesetzt.", number)
             return False
         else:
-            if verbose is True:
-                st.write(
-                    "Keine Aussage ist möglich und daher wählen einer neuen Zufallszahl a."
-                )
-    if verbose is True:
-        st.write(
-            f"Es wurden alle {k} Runden probiert und da kein Zerlegung gefunden wurde folgt:"
+            if trace is not None:
+                trace("Keine Aussage ist möglich und daher wählen einer neuen Zufallszahl a.")
+    if trace is not None:
+        trace(
+            "Es wurden alle {} Runden probiert und da kein Zerlegung gefunden wurde folgt:", k
         )
-        st.write(
-            f"Die Zahl {number} ist vermutlich prim da für die {k} Durchläufe kein Beweis gefunden wurde."
+        trace(
+            "Die Zahl {} ist vermutlich prim da für die {} Durchläufe kein Beweis gefunden wurde.",
+            number,
+            k,
         )
     return True
 
 
-def millerrabin(number, runden, verbose):
+# (limit, bases): every odd number below limit that passes the strong test for
+# all bases is prime (Jaeschke, Sinclair, Sorenson & Webster)
+MILLERRABIN_BASES = (
+    (2_047, (2,)),
+    (1_373_653, (2, 3)),
+    (9_080_191, (31, 73)),
+    (25_326_001, (2, 3, 5)),
+    (4_759_123_141, (2, 7, 61)),
+    (1_122_004_669_633, (2, 13, 23, 1662803)),
+    (2_152_302_898_747, (2, 3, 5, 7, 11)),
+    (3_474_749_660_383, (2, 3, 5, 7, 11, 13)),
+    (341_550_071_728_321, (2, 3, 5, 7, 11, 13, 17)),
+    (2**64, (2, 325, 9375, 28178, 450775, 9780504, 1795265022)),
+    (318_665_857_834_031_151_167_461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+    (
+        3_317_044_064_679_887_385_961_981,
+        (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41),
+    ),
+)
+
+
+def deterministic_bases(number):
+    # the entry (limit, bases) of MILLERRABIN_BASES that covers number, None above all limits
+    for limit, bases in MILLERRABIN_BASES:
+        if number < limit:
+            return limit, bases
+    return None
+
+
+def strong_lucas(number, trace=None):
+    if number == 2:
+        return True
+    if number < 2 or number % 2 == 0:
+        return False
+    if math.isqrt(number) ** 2 == number:
+        if trace is not None:
+            trace("Die Zahl {} ist eine Quadratzahl.", number)
+        return False
+
+    # Selfridge: first D in 5, -7, 9, -11, ... with (D/n) = -1
+    D = 5
+    while True:
+        j = jacobi(D, number)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != number:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+    if trace is not None:
+        trace("Die Lucas-Parameter lauten D = {}, P = {} und Q = {}.", D, P, Q)
+
+    s, d = 0, number + 1
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    U, V, Qk = lucas_sequence(d, P, Q, number)
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V, Qk = (V * V - 2 * Qk) % number, Qk * Qk % number
+        if V == 0:
+            return True
+    if trace is not None:
+        trace("Die Zahl {} ist keine starke Lucas-Pseudoprimzahl.", number)
+    return False
+
+
+# below this size the fixed Miller-Rabin bases are cheaper than detecting a form
+SPECIAL_FORM_BITS = 64
+
+
+def lucas_lehmer(p):
+    # 2^p - 1 for an odd prime p, s -> s^2 - 2 with mod 2^p - 1 as shift and mask
+    M = (1 << p) - 1
+    s = 4
+    for _ in range(p - 2):
+        s = s * s + M - 2
+        s = (s & M) + (s >> p)
+        s = (s & M) + (s >> p)
+    return s == 0 or s == M
+
+
+def pepin(m):
+    # 2^m + 1 for m = 2^k > 1, prime iff 3^(2^(m - 1)) = -1, mod 2^m + 1 as shift and subtract
+    F = (1 << m) + 1
+    M = (1 << m) - 1
+    x = 3
+    for _ in range(m - 1):
+        x = x * x
+        x = (x & M) - (x >> m)
+        while x < 0:
+            x += F
+    return x == F - 1
+
+
+def proth(number, n):
+    # k 2^n + 1 with k < 2^n is prime iff a^((number - 1) / 2) = -1 for any a with (a/number) = -1
+    for a in small_primes(1 << 10)[1:].tolist():
+        j = jacobi(a, number)
+        if j == 0:
+            return number == a
+        if j == -1:
+            return pow(a, (number - 1) >> 1, number) == number - 1
+    return None
+
+
+def special_form_test(number):
+    # (name, is prime) for odd numbers 2^p - 1, 2^2^k + 1 and k 2^n + 1 with k < 2^n,
+    # None for every other number
+    if number < 7 or number % 2 == 0:
+        return None
+    if number & (number + 1) == 0:
+        p = number.bit_length()
+        return "lucas_lehmer", millerrabin(p, 0, None, mode="deterministic") and lucas_lehmer(p)
+    n = ((number - 1) & (1 - number)).bit_length() - 1
+    k = (number - 1) >> n
+    if k == 1:
+        # 2^n + 1 is composite unless n is a power of two
+        return "pepin", n & (n - 1) == 0 and pepin(n)
+    if k < 1 << n:
+        result = proth(number, n)
+        if result is not None:
+            return "proth", result
+    return None
+
+
+def millerrabin(number, runden, trace=None, mode="random"):
+    # mode: "random" tests `runden` random bases, "deterministic" uses the fixed
+    # base sets above (and BPSW beyond them), "bpsw" runs base 2 plus strong Lucas
     if number <= 1:
-        if verbose is True:
-            st.write(f"Die Zahl {number} ist kleiner oder gleich 1.")
+        if trace is not None:
+            trace("Die Zahl {} ist kleiner oder gleich 1.", number)
         return False
     if number <= 3:
-        if verbose is True:
-            st.write(f"Die Zahl {number} ist kleiner oder gleich 3.")
+        if trace is not None:
+            trace("Die Zahl {} ist kleiner oder gleich 3.", number)
         return True
     if number % 2 == 0:
-        if verbose is True:
-            st.write(f"Die Zahl {number} ist durch 2 teilbar also kein Primzahl.")
+        if trace is not None:
+            trace("Die Zahl {} ist durch 2 teilbar also kein Primzahl.", number)
         return False
+    if mode != "random" and number.bit_length() > SPECIAL_FORM_BITS:
+        special = special_form_test(number)
+        if special is not None:
+            if trace is not None:
+                trace(
+                    "Die Zahl {} hat eine spezielle Form und wird mit dem Test {} geprüft.",
+                    number,
+                    special[0],
+                )
+            return special[1]
     r, d = 0, number - 1
     while d % 2 == 0:
         d //= 2
         r += 1
 
-    def millerrabinloop(a, verbose):
+    def millerrabinloop(a, trace):
         x = pow(a, d, number)
-        if verbose is True:
-            latex = r"{a}^{d} mod {number}"
-            st.write(f"Die Zahl {x} wird durch ${latex}$ berechnet.")
+        if trace is not None:
+            trace("Die Zahl {} wird durch ${}^{{{}}} mod {}$ berechnet.", x, a, d, number)
         if x == 1 or x == number - 1:
-            if verbose is True:
-                st.write(
-                    f"Da die Zahl {x} entweder 1 oder -1 entspricht, kann keine Aussage mit {a} getroffen werden."
+            if trace is not None:
+                trace(
+                    "Da die Zahl {} entweder 1 oder -1 entspricht, kann keine Aussage mit {} getroffen werden.",
+                    x,
+                    a,
                 )
             return True
         for _ in range(r - 1):
             x = pow(x, 2, number)
             if x == number - 1:
-                if verbose is True:
-                    st.write(
-                        f"Da die Zahl {x} = {number - 1} folgt, dass keine Aussage mit {a} getroffen werden kann."
+                if trace is not None:
+                    trace(
+                        "Da die Zahl {} = {} folgt, dass keine Aussage mit {} getroffen werden kann.",
+                        x,
+                        number - 1,
+                        a,
                     )
                 return True
-        if verbose is True:
-            st.write(
-                f"Mit der Zahl {a} lässt sich beweisen, dass {number} keine Primzahl ist."
-            )
+        if trace is not None:
+            trace("Mit der Zahl {} lässt sich beweisen, dass {} keine Primzahl ist.", a, number)
         return False
 
+    if mode == "deterministic":
+        entry = deterministic_bases(number)
+        if entry is None:
+            mode = "bpsw"
+        else:
+            limit, bases = entry
+            if trace is not None:
+                trace("Für Zahlen kleiner {} genügen die festen Basen {}.", limit, list(bases))
+            for a in bases:
+                if a % number == 0:
+                    continue
+                if not millerrabinloop(a % number, trace):
+                    if trace is not None:
+                        trace("Die Zahl {} ist zusammengesetzt.", number)
+                    return False
+            if trace is not None:
+                trace(
+                    "Die Zahl {} ist eine Primzahl, da keine der festen Basen eine Zerlegung beweist.",
+                    number,
+                )
+            return True
+
+    if mode == "bpsw":
+        if trace is not None:
+            trace("Es wird der Baillie-PSW-Test (Basis 2 und starker Lucas-Test) verwendet.")
+        if not millerrabinloop(2, trace) or not strong_lucas(number, trace):
+            if trace is not None:
+                trace("Die Zahl {} ist zusammengesetzt.", number)
+            return False
+        if trace is not None:
+            trace(
+                "Die Zahl {} ist vermutlich prim, es ist keine Baillie-PSW-Pseudoprimzahl bekannt.",
+                number,
+            )
+        return True
+
+    if mode != "random":
+        raise NotImplementedError(f"Mode {mode} not implemented")
+
     for _ in range(runden):
         a = random.randint(2, number - 2)
-        if verbose is True:
-            st.write(
-                f"Es wird ein Zufallszahl {a} generiert zwischen 2 und {number -2}."
-            )
-            st.write(
-                f"Es wird ein Schreife zum Testen mit der Zufallszahl {a} begonnen."
-            )
-        if not millerrabinloop(a, verbose):
-            if verbose is True:
-                st.write(f"Die Zahl {number} ist zusammengesetzt.")
+        if trace is not None:
+            trace("Es wird ein Zufallszahl {} generiert zwischen 2 und {}.", a, number - 2)
+            trace("Es wird ein Schreife zum Testen mit der Zufallszahl {} begonnen.", a)
+        if not millerrabinloop(a, trace):
+            if trace is not None:
+                trace("Die Zahl {} ist zusammengesetzt.", number)
             return False
-    if verbose is True:
-        st.write(
-            f"Die Zahl {number} ist vermutlich prim, da in den {runden} Runden kein Beweis für eine Zerlegung gefunden wurde."
+    if trace is not None:
+        trace(
+            "Die Zahl {} ist vermutlich prim, da in den {} Runden kein Beweis für eine Zerlegung gefunden wurde.",
+            number,
+            runden,
         )
     return True
 
 
-def expand_x_1(number):
-    c = 1
-    for i in range(number // 2 + 1):
-        c = c * (number - i) // (i + 1)
-        yield c
+# ----------------------------------------BATCH----------------------------------------
+
+# numpy lanes use Montgomery arithmetic with R = 2^64, so n must stay below 2^63
+BATCH_LIMIT = 1 << 63
+# lanes per kernel call, keeps the temporaries inside the cache
+BATCH_CHUNK = 1 << 15
+MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def mul_wide(a, b):
+    # full 128 bit product of two uint64 arrays as (hi, lo)
+    a0, a1 = a & MASK32, a >> np.uint64(32)
+    b0, b1 = b & MASK32, b >> np.uint64(32)
+    p00, p01, p10 = a0 * b0, a0 * b1, a1 * b0
+    mid = (p00 >> np.uint64(32)) + (p01 & MASK32) + (p10 & MASK32)
+    hi = a1 * b1 + (p01 >> np.uint64(32)) + (p10 >> np.uint64(32)) + (mid >> np.uint64(32))
+    return hi, a * b
+
+
+def montgomery_mul(a, b, n, n_inv):
+    # a * b / 2^64 mod n for odd n < 2^63 and a, b < n
+    hi, lo = mul_wide(a, b)
+    mhi, _ = mul_wide(lo * n_inv, n)
+    t = hi + mhi + (lo != 0)
+    # branchless t - n if t >= n, np.where is slow on random masks
+    return t - n * (t >= n)
+
+
+def montgomery_setup(n):
+    # -n^-1 mod 2^64 by Newton iteration, 2^64 mod n and 2^128 mod n
+    inv = n.copy()
+    for _ in range(5):
+        inv *= np.uint64(2) - n * inv
+    r1 = (np.uint64(0xFFFFFFFFFFFFFFFF) % n + np.uint64(1)) % n
+    r2 = r1.copy()
+    for _ in range(64):
+        r2 = r2 << np.uint64(1)
+        r2 -= n * (r2 >= n)
+    return np.uint64(0) - inv, r1, r2
+
+
+def millerrabin_many(n):
+    # strong test on odd uint64 3 < n < 2^63 with the deterministic base sets
+    n_inv, one, r2 = montgomery_setup(n)
+    d = n - np.uint64(1)
+    s = np.zeros(len(n), dtype=np.uint64)
+    while np.any(even := (d & np.uint64(1)) == 0):
+        d >>= even
+        s += even
+    lanes = np.arange(len(n))
+    result = np.ones(len(n), dtype=bool)
+
+    for base in deterministic_bases(int(n.max()))[1]:
+        a = np.uint64(base) % n
+        skip = a == 0
+        a = montgomery_mul(a, r2, n, n_inv)
+        x, e = one.copy(), d.copy()
+        while np.any(e):
+            bit = e & np.uint64(1)
+            x += (montgomery_mul(x, a, n, n_inv) - x) * bit
+            a = montgomery_mul(a, a, n, n_inv)
+            e >>= np.uint64(1)
+        minus_one = n - one
+        passed = skip | (x == one) | (x == minus_one)
+        for i in range(1, int(s.max())):
+            x = montgomery_mul(x, x, n, n_inv)
+            passed |= (x == minus_one) & (i < s)
+
+        # only lanes that survived this base go on to the next one
+        result[lanes[~passed]] = False
+        lanes, n, n_inv, one, r2, d, s = (
+            v[passed] for v in (lanes, n, n_inv, one, r2, d, s)
+        )
+        if len(n) == 0:
+            break
+    return result
+
+
+def is_prime_many(numbers):
+    # primality of a whole batch, word-size values run vectorised in numpy
+    if isinstance(numbers, np.ndarray) and numbers.dtype.kind in "iu":
+        values = numbers.ravel()
+        small = values >= 0
+        if values.dtype.kind == "u":
+            small &= values < BATCH_LIMIT
+        fast = values.astype(np.uint64)
+        values = values.tolist()
+        shape = numbers.shape
+    else:
+        values = [int(i) for i in numbers]
+        small = np.array([0 <= i < BATCH_LIMIT for i in values], dtype=bool)
+        fast = np.array([i if 0 <= i < BATCH_LIMIT else 0 for i in values], dtype=np.uint64)
+        shape = (len(values),)
+
+    result = np.zeros(len(values), dtype=bool)
+    # big values with a small factor are dropped by one remainder tree
+    big = [i for i in np.flatnonzero(~small).tolist() if values[i] > 1]
+    for i, g in zip(big, primorial_gcds(values[i] for i in big)):
+        if g == 1:
+            result[i] = millerrabin(values[i], 0, None, mode="deterministic")
+
+    # trial division by the primes below 64 settles most of the batch
+    idx = np.flatnonzero(small)
+    n = fast[idx]
+    undecided = n > 1
+    for p in small_primes(64).tolist():
+        p = np.uint64(p)
+        result[idx[n == p]] = True
+        undecided &= n % p != 0
+    idx, n = idx[undecided], n[undecided]
+    result[idx[n < 64 * 64]] = True
+    idx, n = idx[n >= 64 * 64], n[n >= 64 * 64]
+    for i in range(0, len(n), BATCH_CHUNK):
+        chunk = slice(i, i + BATCH_CHUNK)
+        result[idx[chunk]] = millerrabin_many(n[chunk])
+    return result.reshape(shape)
+
+
+def integer_root(number, k):
+    # largest x with x^k <= number (Newton iteration on integers)
+    if number < 2:
+        return number
+    x = 1 << -(-number.bit_length() // k)
+    while True:
+        y = ((k - 1) * x + number // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def is_perfect_power(number):
+    for k in range(2, number.bit_length() + 1):
+        if integer_root(number, k) ** k == number:
+            return True
+    return False
 
 
-def aks(number):
-    if number == 1:
-        return False
-    if number == 2:
-        return True
-    for i in expand_x_1(number):
-        if i % number:
+def multiplicative_order_exceeds(number, r, limit):
+    # True if the order of number mod r is larger than limit
+    x = 1
+    for _ in range(limit):
+        x = x * number % r
+        if x == 1:
             return False
     return True
 
 
-# ----------------------------------------STREAMLIT----------------------------------------
-"""
-st.header("Primzahltest")
-
-option = st.selectbox(
-    "Welche Primzahltest-Methode soll gemacht werden?",
-    [
-        "Bruteforce-Methode",
-        "Sieb des Eratosthenes",
-        "Sieb von Atkin",
-        "Fermatscher Primzahltest",
-        "Solovay-Strassen-Test",
-        "Miller-Rabin-Test",
-        "Agrawal-Kayal-Saxena-Primzahltest",
-    ],
-    index=0,
-)
+def euler_phi(r):
+    result, m, p = r, r, 2
+    while p * p <= m:
+        if m % p == 0:
+            while m % p == 0:
+                m //= p
+            result -= result // p
+        p += 1
+    if m > 1:
+        result -= result // m
+    return result
+
+
+def poly_power(a, r, number):
+    # (X + a)^number mod (X^r - 1, number) by Kronecker substitution: the polynomial
+    # lives in one big int with `size` bytes per coefficient, so every step is a
+    # single big-int squaring followed by one pass that reduces the slots mod number
+    size = ((r * (number - 1) ** 2 * (a + 1)).bit_length() + 7) // 8
+    bits = 8 * size * r
+    mask = (1 << bits) - 1
+
+    poly = a + (1 << 8 * size)
+    for bit in bin(number)[3:]:
+        poly = poly * poly
+        # X^r = 1 folds the upper half onto the lower one, slots never overflow
+        poly = (poly & mask) + (poly >> bits)
+        if bit == "1":
+            poly = (poly << 8 * size) + a * poly
+            poly = (poly & mask) + (poly >> bits)
+        data = poly.to_bytes(size * r, "little")
+        poly = int.from_bytes(
+            b"".join(
+                (int.from_bytes(data[i : i + size], "little") % number).to_bytes(size, "little")
+                for i in range(0, size * r, size)
+            ),
+            "little",
+        )
+    return poly, size
 
-verbose = st.checkbox("Ist eine detailierte Beschreibung gewünscht?")
 
-number = st.number_input("Welche Zahl soll geprüft werden?", value=1, min_value=1)
+def aks(number):
+    if number == 1:
+        return False
+    if number == 2:
+        return True
+    if is_perfect_power(number):
+        return False
 
-# st.write(f"Die ausgewählte zu testende Zahl lautet: " + str(number))
-# st.write(f"Der ausgewählte Primzahltest lautet: " + str(option))
+    # smallest r with ord_r(n) > log2(n)^2
+    log2 = math.log2(number)
+    limit = math.floor(log2**2)
+    r = 2
+    while not (math.gcd(r, number) == 1 and multiplicative_order_exceeds(number, r, limit)):
+        r += 1
 
-# True  --> prim
-# False --> zusammengesetzt
+    for a in range(2, min(r, number - 1) + 1):
+        if 1 < math.gcd(a, number) < number:
+            return False
+    if number <= r:
+        return True
 
-if option == "Bruteforce-Methode":
-    st.write(
-        "Die Bruteforce-Methode probiert alle Zahlen von 2 bis zur Wurfel aus "
-        + str(number)
-        + " durch."
-    )
-    if bruteforce(number, verbose):
-        st.write("Die Zahl " + str(number) + " ist eine Primzahl.")
-    else:
-        st.write("Die Zahl " + str(number) + " ist keine Primzahl.")
-
-if option == "Sieb des Eratosthenes":
-    st.write(
-        "Bei dem Sieb des Eratosthenes werden alle Primzahlen die kleiner als "
-        + str(number)
-        + " sind als Teiler durchprobiert."
-    )
-    if eratosthenes(number, verbose):
-        st.write("Die Zahl " + str(number) + " ist eine Primzahl.")
-    else:
-        st.write("Die Zahl " + str(number) + " ist keine Primzahl.")
-
-if option == "Sieb von Atkin":
-    st.write(
-        "Der Sieb von Atkin ist ein Algorithmus zur Bestimmung von Primzahlen, der eine mathematische Transformation der Quadrate und Reste verwendet, um Kandidaten für Primzahlen zu identifizieren. "
-        "Er durchläuft ein Gitter von Zahlen und wendet bestimmte Modulo-Bedingungen an, um Zahlen zu markieren, die Primzahlen sein könnten. "
-        "Schließlich entfernt er Vielfache von gefundenen Primzahlen, um die endgültige Liste der Primzahlen zu erstellen."
-    )
-    if atkin(number, verbose):
-        st.write("Die Zahl " + str(number) + " ist eine Primzahl.")
-    else:
-        st.write("Die Zahl " + str(number) + " ist keine Primzahl.")
-
-if option == "Fermatscher Primzahltest":
-    latex1 = r"a^{p-1} \equiv 1 (mod p)"
-    latex2 = r"a^{n-1} \equiv 1 (mod n)"
-    st.write(
-        rf"Der Fermat-Primzahltest basiert auf dem kleinen Fermatschen Satz, der besagt, dass für eine Primzahl p und eine Basis a gilt: ${latex1}$. Um zu prüfen, ob eine Zahl n prim ist, wählt man eine Basis a  und überprüft, ob ${latex2}$. Wenn diese Bedingung nicht erfüllt ist, ist n definitiv keine Primzahl, aber wenn sie erfüllt ist, ist n wahrscheinlich prim, aber nicht garantiert."
-    )
-    if fermat(number, verbose):
-        st.write(
-            "Die Zahl "
-            + str(number)
-            + " ist vermeintlich eine Primzahl, aber es könnte auch eine Carmichael-Zahl sein."
-        )
-    else:
-        st.write("Die Zahl " + str(number) + " ist keine Primzahl.")
-
-if option == "Solovay-Strassen-Test":
-    latex1 = r"\left(\frac{a}{n} \right)"
-    latex2 = r"a^{(n-1)/2} \equiv \left(\frac{a}{n}\right) \ (\text{mod} \ n)"
-    st.write(
-        rf"Der Solovay-Strassen-Primzahltest basiert auf dem Euler-Kriterium und verwendet die Jacobi-Symbole zur Bestimmung der Primalität. Für eine gegebene Zahl n und eine zufällige Basis a, berechnet der Test das Jacobi-Symbol ${latex1}$ und überprüft, ob ${latex2}$. Wenn diese Bedingung nicht erfüllt ist, ist n keine Primzahl; wenn sie erfüllt ist, ist n wahrscheinlich prim, jedoch besteht immer ein kleines Risiko, dass n eine Pseudoprimzahl ist."
-    )
-    runden = st.number_input(
-        "Wieviele Runden sollen durchlaufen bzw. getestet werden?",
-        value=5,
-        min_value=5,
-        max_value=100,
-    )
-    if solovaystrassen(number, runden, verbose):
-        st.write(
-            "Die Zahl "
-            + str(number)
-            + " ist vermeintlich eine Primzahl, aber es könnte auch eine Pseudo-Primzahl sein."
-        )
-    else:
-        st.write("Die Zahl " + str(number) + " ist keine Primzahl.")
-
-if option == "Miller-Rabin-Test":
-    latex1 = r"2^s \cdot d"
-    latex2 = r"a^d mod n = 1"
-    latex3 = r"a^{2^r \cdot d} \equiv -1"
-    latex4 = r"0 \leq r < s"
-    st.write(
-        rf"Der Miller-Rabin-Primzahltest ist ein probabilistischer Algorithmus, der auf der Faktorisierung n-1 in die Form ${latex1}$ basiert, wobei n die zu testende Zahl ist. Eine zufällig gewählte Basis a wird verwendet, um zu prüfen, ob  ${latex2}$  oder ob eine der Bedingungen ${latex3}$ für ${latex4}$ erfüllt ist. Wenn keine dieser Bedingungen erfüllt ist, ist n zusammengesetzt; andernfalls ist n wahrscheinlich prim."
-    )
-    runden = st.number_input(
-        "Wieviele Runden sollen durchlaufen bzw. getestet werden?",
-        value=5,
-        min_value=5,
-        max_value=100,
-    )
-    if millerrabin(number, runden, verbose):
-        st.write("Die Zahl " + str(number) + " ist vermeintlich eine Primzahl.")
-    else:
-        st.write("Die Zahl " + str(number) + " ist keine Primzahl.")
-
-if option == "Agrawal-Kayal-Saxena-Primzahltest":
-    latex1 = r"(x - a)^n \equiv (x^n - a)"
-    latex2 = r"a \in \Z"
-    latex3 = r"\left\lfloor \sqrt{\phi(r)} \log(n) \right\rfloor  "
-    latex4 = r"ggt(a, n) \neq 1"
-    latex5 = r"(x + a)^n \equiv x^n + a \ (\text{mod} \ n, x^r - 1)"
-    st.write(
-        f"Der AKS-Primzahltest (benannt nach seinen Erfindern Agrawal, Kayal und Saxena) ist ein deterministischer Algorithmus zur Bestimmung der Primalität einer Zahl. "
-        f"Der Test basiert auf der Eigenschaft, dass eine Zahl n genau dann prim ist, wenn ${latex1}$ für alle ${latex2}$ gilt. "
-        f"Der AKS-Test überprüft diese Eigenschaft unter eingeschränkten Bedingungen, um die Komplexität zu reduzieren. Zuerst wird festgestellt, ob n eine perfekte Potenz ist. "
-        f"Wenn ja, ist n keine Primzahl. Andernfalls wird eine geeignete Grenze r bestimmt, sodass n für die Mehrheit der Basen a keine nichttrivialen r-Wurzeln besitzt. "
-        f"Dies wird durch iteratives Finden des kleinsten r erreicht, für das die Ordnung von n modulo r groß genug ist. "
-        f"Der Algorithmus überprüft dann für jedes a von 1 bis ${latex3}$, ob ${latex4}$. Falls ein solches 𝑎 a gefunden wird, ist n keine Primzahl. "
-        f"Schließlich wird getestet, ob ${latex5}$ für jedes a in diesem Bereich gilt. Wenn alle diese Tests bestanden werden, ist n prim, andernfalls nicht. "
-        f"Der AKS-Primzahltest ist der erste bekannte deterministische Algorithmus mit polynomieller Laufzeit, der die Primalität jeder beliebigen Zahl ohne Annahmen über unbewiesene Hypothesen überprüft."
-    )
-    if aks(number):
-        st.write(f"{number} ist eine Primzahl.")
-    else:
-        st.write(f"{number} ist keine Primzahl.")"""
+    # (X + a)^n = X^(n mod r) + a mod (X^r - 1, n) for all a up to sqrt(phi(r)) log2(n)
+    for a in range(1, math.floor(math.sqrt(euler_phi(r)) * log2) + 1):
+        poly, size = poly_power(a, r, number)
+        # gcd(r, n) = 1 and a < r < n, so X^(n mod r) and a sit in different slots
+        if poly != (1 << 8 * size * (number % r)) + a:
+            return False
+    return True
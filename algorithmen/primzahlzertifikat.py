@@ -0,0 +1,148 @@
+import json
+import math
+import os
+
+from algorithmen.primfaktorzerlegung import pollard_rho
+from algorithmen.primzahltest import MILLERRABIN_BASES, millerrabin, small_primes, special_form_test
+
+# ----------------------------------------ZERTIFIKATE----------------------------------------
+
+# below this bound the deterministic Miller-Rabin bases are a proof on their own
+PROVEN_LIMIT = MILLERRABIN_BASES[-1][0]
+TRIAL_LIMIT = 1 << 16
+# rho iterations spent on a single cofactor of n - 1 before giving up on it
+RHO_LIMIT = 200_000
+
+
+class CertificateCache:
+    """Certificates by n, optionally appended to a JSON lines file so that
+    other processes and later jobs can reuse them"""
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.certificates = {}
+        if path is not None and os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        certificate = json.loads(line)
+                        self.certificates[certificate["n"]] = certificate
+
+    def get(self, n: int) -> dict | None:
+        return self.certificates.get(n)
+
+    def put(self, certificate: dict) -> None:
+        self.certificates[certificate["n"]] = certificate
+        if self.path is not None:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(certificate) + "\n")
+
+
+CERTIFICATE_CACHE = CertificateCache()
+
+
+def partial_factorization(n: int) -> dict[int, int]:
+    """Factors n - 1 until the proven part F satisfies F^2 > n or the rho budget
+    runs out. Returns {q: exponent} of the prime factors found so far"""
+
+    m, found = n - 1, {}
+    for p in small_primes(TRIAL_LIMIT).tolist():
+        while m % p == 0:
+            found[p] = found.get(p, 0) + 1
+            m //= p
+
+    def proven_part() -> int:
+        return math.prod(q**e for q, e in found.items())
+
+    stack = [m] if m > 1 else []
+    while stack and proven_part() ** 2 <= n:
+        cofactor = stack.pop()
+        if cofactor in found:
+            continue
+        if millerrabin(cofactor, 0, None, mode="deterministic"):
+            # record the full power of the prime in n - 1
+            found[cofactor], rest = 0, n - 1
+            while rest % cofactor == 0:
+                found[cofactor] += 1
+                rest //= cofactor
+            continue
+        d = pollard_rho(cofactor, None, limit=RHO_LIMIT)
+        if d is not None:
+            stack += [d, cofactor // d]
+    return found
+
+
+def prove_prime(n: int, cache: CertificateCache = CERTIFICATE_CACHE) -> dict | None:
+    """Pocklington-Lehmer N-1 certificate for n, None if n is composite.
+    If n - 1 cannot be factored far enough the certificate only records a
+    passed BPSW test and has `proven` set to False"""
+
+    certificate = cache.get(n) if cache is not None else None
+    if certificate is not None and verify_certificate(certificate):
+        return certificate
+
+    if not millerrabin(n, 0, None, mode="deterministic"):
+        return None
+    if n < PROVEN_LIMIT:
+        certificate = {"n": n, "method": "millerrabin", "proven": True}
+    elif (special := special_form_test(n)) is not None:
+        # Lucas-Lehmer, Pepin and Proth are proofs on their own
+        certificate = {"n": n, "method": special[0], "proven": True}
+    else:
+        certificate = pocklington(n, cache)
+
+    if cache is not None:
+        cache.put(certificate)
+    return certificate
+
+
+def pocklington(n: int, cache: CertificateCache) -> dict:
+    fallback = {"n": n, "method": "bpsw", "proven": False}
+    found = partial_factorization(n)
+    if math.prod(q**e for q, e in found.items()) ** 2 <= n:
+        return fallback
+
+    witnesses = []
+    for q in sorted(found):
+        sub = prove_prime(q, cache)
+        if sub is None or not sub["proven"]:
+            return fallback
+        for a in range(2, n):
+            if pow(a, n - 1, n) != 1:
+                # cannot happen for a BPSW-prime, but a witness proves compositeness
+                return fallback
+            g = math.gcd(pow(a, (n - 1) // q, n) - 1, n)
+            if g == 1:
+                witnesses.append({"q": q, "a": a, "certificate": sub})
+                break
+            if g != n:
+                return fallback
+    return {"n": n, "method": "pocklington", "proven": True, "witnesses": witnesses}
+
+
+def verify_certificate(certificate: dict) -> bool:
+    """Re-checks a certificate from prove_prime, only modexps and gcds"""
+
+    n, method = certificate["n"], certificate["method"]
+    if method == "millerrabin":
+        return n < PROVEN_LIMIT and millerrabin(n, 0, None, mode="deterministic")
+    if method == "bpsw":
+        # a BPSW pass is no proof, a cached entry that claims otherwise is rejected
+        return not certificate["proven"] and millerrabin(n, 0, None, mode="bpsw")
+    if method in ("lucas_lehmer", "pepin", "proth"):
+        return special_form_test(n) == (method, True)
+    if method != "pocklington":
+        return False
+
+    m, proven = n - 1, 1
+    for witness in certificate["witnesses"]:
+        q, a, sub = witness["q"], witness["a"], witness["certificate"]
+        # the chain only holds if every q is proven, a BPSW entry never is
+        if sub["n"] != q or sub["method"] == "bpsw" or not verify_certificate(sub):
+            return False
+        if pow(a, n - 1, n) != 1 or math.gcd(pow(a, (n - 1) // q, n) - 1, n) != 1:
+            return False
+        while m % q == 0:
+            proven *= q
+            m //= q
+    return proven**2 > n
@@ -0,0 +1,26 @@
+# ----------------------------------------PROTOKOLL----------------------------------------
+
+# events kept per run, a verbose rho on a large n must not fill the memory
+PROTOKOLL_LIMIT = 100_000
+
+
+class Protokoll:
+    """Sink for the trace events of the algorithms. An event is a str.format
+    template plus its arguments, it is only formatted when a page shows it"""
+
+    def __init__(self, limit: int = PROTOKOLL_LIMIT):
+        self.limit = limit
+        self.events = []
+        self.dropped = 0
+
+    def __call__(self, template: str, *args) -> None:
+        if len(self.events) < self.limit:
+            self.events.append((template, args))
+        else:
+            self.dropped += 1
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def texte(self, start: int = 0, stop: int = None) -> list[str]:
+        return [template.format(*args) for template, args in self.events[start:stop]]
@@ -4,6 +4,8 @@ import typing
 
 import numpy as np
 
+from algorithmen.primzahltabelle import prime_table
+
 
 def smoothness_bound(N):
     logN = math.log(N)
@@ -80,13 +82,9 @@ class quadratic_sieve:
 
     def get_primes(self, number: int, b: int, x: int):
         # Calculating relevant primes
-        numbers = np.arange(2, b + 1)
-        is_prime = np.ones(len(numbers), dtype=bool)
-        for i in range(2, int(b**0.5) + 1):
-            if is_prime[i - 2]:
-                is_prime[i * i - 2 : b + 1 : i] = False
+        numbers = prime_table(b).primes_between(2, b + 1)
         quad_residues = np.vectorize(quad_residue)(numbers, number).astype(bool)
-        primes = numbers[is_prime & quad_residues]
+        primes = numbers[quad_residues]
         # Calculating steps to skip
         ts = np.vectorize(self.compute_tonelli)(primes, x, number)
         return primes, np.vstack(ts).transpose()
@@ -0,0 +1,99 @@
+import random
+
+import numpy as np
+
+from algorithmen.primzahltest import millerrabin, sieve_segment, window_base, window_size
+
+# ----------------------------------------ZUFALLSPRIMZAHLEN----------------------------------------
+
+# below this many bits the window sieve does not pay off, plain rejection sampling
+SIEVE_MIN_BITS = 16
+
+
+def is_probable_prime(n: int) -> bool:
+    return millerrabin(n, 0, None, mode="deterministic")
+
+
+def sieve_base(low: int) -> list[int]:
+    # only primes p with p^2 < low, so no window can contain a base prime itself
+    return [p for p in window_base(low) if p * p < low]
+
+
+def random_prime_between(low: int, high: int, rng: random.Random) -> int:
+    """Prime low <= p < high: incremental search from a random odd start, the
+    window is sieved with the small primes and only survivors are tested"""
+
+    if high.bit_length() <= SIEVE_MIN_BITS:
+        while True:
+            candidate = rng.randrange(low, high)
+            if is_probable_prime(candidate):
+                return candidate
+
+    base, size = sieve_base(low), window_size(high)
+    while True:
+        start = rng.randrange(low, high) | 1
+        while start < high:
+            segment = sieve_segment(start, size, base)
+            for i in np.flatnonzero(segment).tolist():
+                candidate = start + 2 * i
+                if candidate < high and is_probable_prime(candidate):
+                    return candidate
+            start += 2 * size
+
+
+def random_prime(bits: int, rng: random.Random = None) -> int:
+    """Random prime with exactly bits bits"""
+
+    if bits < 2:
+        raise ValueError("bits must be at least 2")
+    rng = rng or random.Random()
+    return random_prime_between(1 << (bits - 1), 1 << bits, rng)
+
+
+def random_safe_prime(bits: int, rng: random.Random = None) -> int:
+    """Random prime p = 2q + 1 with q prime and exactly bits bits. The window over q
+    is sieved for q and 2q + 1 at once, so only pairs without small factors are tested"""
+
+    if bits < 3:
+        raise ValueError("bits must be at least 3")
+    rng = rng or random.Random()
+    low, high = 1 << (bits - 2), 1 << (bits - 1)
+    if bits <= SIEVE_MIN_BITS:
+        while True:
+            q = random_prime_between(low, high, rng)
+            if is_probable_prime(2 * q + 1):
+                return 2 * q + 1
+
+    base, size = sieve_base(low), window_size(high)
+    while True:
+        start = rng.randrange(low, high) | 1
+        while start < high:
+            segment = sieve_segment(start, size, base)
+            # 2(start + 2i) + 1 = 0 mod p for i = -(2 start + 1) / 4 mod p
+            for p in base:
+                segment[-(2 * start + 1) * pow(4, -1, p) % p :: p] = False
+            for i in np.flatnonzero(segment).tolist():
+                q = start + 2 * i
+                if q < high and is_probable_prime(q) and is_probable_prime(2 * q + 1):
+                    return 2 * q + 1
+            start += 2 * size
+
+
+def random_semiprime(bits: int, balance: float = 0.5, rng: random.Random = None) -> tuple[int, int, int]:
+    """Random n = p * q with exactly bits bits, p has about balance * bits of them.
+    Both primes have their two top bits set, which fixes the bit length of n.
+    Returns (n, p, q)"""
+
+    if not 0 < balance <= 0.5:
+        raise ValueError("balance must be in (0, 0.5]")
+    if bits < 10:
+        raise ValueError("bits must be at least 10")
+    rng = rng or random.Random()
+    p_bits = max(5, round(bits * balance))
+    q_bits = bits - p_bits
+
+    p = random_prime_between(3 << (p_bits - 2), 1 << p_bits, rng)
+    while True:
+        q = random_prime_between(3 << (q_bits - 2), 1 << q_bits, rng)
+        if q != p:
+            return p * q, p, q
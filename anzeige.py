@@ -0,0 +1,29 @@
+import math
+
+import streamlit as st
+
+from algorithmen.protokoll import Protokoll
+
+# events rendered per page of the detailed description
+EVENTS_PER_PAGE = 50
+
+
+def protokoll_anzeigen(protokoll: Protokoll, key: str):
+    """Shows one page of the collected events, only that page is formatted and sent"""
+
+    if len(protokoll) == 0:
+        return
+    pages = math.ceil(len(protokoll) / EVENTS_PER_PAGE)
+    page = 1
+    if pages > 1:
+        page = st.number_input(
+            f"Seite der Beschreibung (1 bis {pages})",
+            value=1,
+            min_value=1,
+            max_value=pages,
+            key=key,
+        )
+    start = (page - 1) * EVENTS_PER_PAGE
+    st.write("  \n".join(protokoll.texte(start, start + EVENTS_PER_PAGE)))
+    if protokoll.dropped:
+        st.write(f"{protokoll.dropped} weitere Schritte wurden nicht aufgezeichnet.")
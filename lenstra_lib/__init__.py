@@ -1,4 +1,4 @@
+# plotting and widget helpers import plotly and streamlit, the pages load them
+# from lenstra_lib.plots and lenstra_lib.streamlit directly
 from .common import check_num
-from .plots import draw_curve, draw_multi_curve, valid_weierstrass, get_weierstrass_points, is_on_curve
-from .streamlit import set_default_session, sidebar_content
 from .lenstra import streamlit_lenstra, InvalidCurve
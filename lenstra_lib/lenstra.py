@@ -8,7 +8,8 @@ import dataclasses
 import typing
 
 import math
-import sympy
+
+from algorithmen.primzahltabelle import prime_table
 
 
 @dataclasses.dataclass
@@ -174,7 +175,8 @@ class WeierstrassPoint:
                     point = next_point
 
         if mode == 0:
-            primes = sympy.primerange(sympy.prime(max_mul) + 1)
+            table = prime_table()
+            primes = iter(table.primes_between(2, table.nth_prime(max_mul) + 1).tolist())
         elif mode == 1:
             primes = range(2, max_mul + 2).__iter__()
         else:
@@ -2,7 +2,8 @@ import math
 import random
 import time
 
-from sympy import isprime, nextprime, factorint
+from algorithmen.primzahltabelle import prime_table
+from algorithmen.zufallsprimzahlen import random_semiprime
 
 import sys
 
@@ -206,13 +207,14 @@ class BNode:
 
 
 if __name__ == '__main__':
-    n = nextprime(184_791_471)
-    n = n * nextprime(n * 3 + 1)
+    # 28 and 30 bit factors, seeded so that runs stay comparable
+    n, _, _ = random_semiprime(58, 0.48, random.Random(184_791_471))
     print(f"Factorizing {n} ({len(str(n))} digits) using Lenstra's algorithm")
 
     b1, b2 = get_bounds(n)
-    k1 = math.lcm(*[x for x in range(2, b1 + 1) if isprime(x)])
-    k2 = [x for x in range(b1, b2 + 1) if isprime(x)]
+    table = prime_table(b2)
+    k1 = math.prod(table.primes_between(2, b1 + 1).tolist())
+    k2 = table.primes_between(b1, b2 + 1).tolist()
     print(f"Using bounds `B₁: {b1:.0e}` and `B₂: {b2:.0e}`")
 
     try:
@@ -2,9 +2,11 @@ import copy
 import math
 import random
 import numpy as np
-import sympy as sm
 import time
 
+from algorithmen.primzahltabelle import prime_table
+from algorithmen.zufallsprimzahlen import random_semiprime
+
 # Default Lenstra implementation with vectorized operations
 
 
@@ -107,8 +109,9 @@ class TwistedEdwardsLenstra:
     def lenstra(self) -> int | None:
         print(f"Factorizing {self.n} using Lenstra's algorithm")
 
-        k1 = math.lcm(*[x for x in range(2, self.b1 + 1) if sm.isprime(x)])
-        k2 = np.array([x for x in range(self.b1, self.b2 + 1) if sm.isprime(x)])
+        table = prime_table(self.b2)
+        k1 = math.prod(table.primes_between(2, self.b1 + 1).tolist())
+        k2 = table.primes_between(self.b1, self.b2 + 1)
         print(f"Using bounds `B₁: {self.b1:.0e}` and `B₂: {self.b2:.0e}`")
 
         t = time.perf_counter()
@@ -123,8 +126,8 @@ class TwistedEdwardsLenstra:
 
 
 if __name__ == '__main__':
-    n = sm.nextprime(184_791_471)
-    n = n * sm.nextprime(n * 3 + 1)
+    # 28 and 30 bit factors, seeded so that runs stay comparable
+    n, _, _ = random_semiprime(58, 0.48, random.Random(184_791_471))
 
     curve = TwistedEdwardsLenstra(n)
     curve.lenstra()
@@ -1,287 +1,68 @@
-import math
-import random
-
 import streamlit as st
 
-# ----------------------------------------PRIMZAHLTEST----------------------------------------
-
-
-def bruteforce(number, verbose):
-    if number == 1:
-        return False
-    for i in range(2, int((number ** (1 / 2)) + 1)):
-        if number % i == 0:
-            if verbose is True:
-                st.text(f"{i} ist ein echter Teiler von {number}.")
-                st.text(f"Die Zahl {number} ist zusammengesetzt.")
-                st.text(f"{number} = {i} * {number // i}")
-            return False
-        else:
-            if verbose is True:
-                st.text(f"{i} ist kein Teiler von {number}")
-    return True
-
-
-def eratosthenes(number, verbose):
-    primes = []
-    if number == 1:
-        return False
-    for i in range(2, number):
-        if bruteforce(i, 0) == 1:
-            primes.append(i)
-            if verbose is True:
-                st.write(f"{i} ist die nächte Primzahl.")
-            if number % i == 0:
-                if verbose is True:
-                    st.write(f"Die Primzahl {i} ist ein echter Teiler von {number}.")
-                    st.write(f"Die Zahl {number} ist zusammengesetzt.")
-                    st.write(f"{number} = {i} * {number // i}")
-                return False
-            else:
-                if verbose is True:
-                    st.write(f"Aber {i} ist kein Teiler von {number}.")
-    if verbose is True:
-        st.write(f"Alle Primzahlen bis {number} lauten: {primes}")
-    return True
-
-
-def atkin(number, verbose):
-    if verbose is True:
-        st.write(
-            "Die Modulo-Bedingungen sehen wie folgt aus: \n"
-            "1. x^2 + y^2 = n    (mod 60) wobei n % 60 in (1, 13, 17, 29, 37, 41, 49, 53) enthalten sein muss. \n"
-            "2. x^2 + 3y^2 = n   (mod 60) wobei n % 60 in (7, 19, 31, 43) enthalten sein muss. \n"
-            "3. 3x^2 - y^2 = n   (mod 60) wobei n % 60 in (11, 23, 47, 59) enthalten sein muss. \n"
-        )
-    sieve = [False] * (number + 1)
-    sqrt_limit = int(math.sqrt(number)) + 1
-
-    for x in range(1, sqrt_limit):
-        for y in range(1, sqrt_limit):
-            n = 4 * x**2 + y**2
-            if n <= number and n % 60 in {1, 13, 17, 29, 37, 41, 49, 53}:
-                sieve[n] = not sieve[n]
-            n = 3 * x**2 + y**2
-            if n <= number and n % 60 in {7, 19, 31, 43}:
-                sieve[n] = not sieve[n]
-            n = 3 * x**2 - y**2
-            if x > y and n <= number and n % 60 in {11, 23, 47, 59}:
-                sieve[n] = not sieve[n]
-
-    for n in range(5, sqrt_limit):
-        if sieve[n]:
-            for k in range(n**2, number + 1, n**2):
-                sieve[k] = False
-
-    primes = [2, 3] if number > 2 else []
-    primes += [n for n in range(5, number + 1) if sieve[n]]
-    if verbose is True:
-        st.write(f"Alle Primzahlen bis {number} lauten: {primes}")
-    if number in primes:
-        if verbose is True:
-            st.write(f"Die Zahl {number} kommt im Array vor.")
-        return True
-    else:
-        if verbose is True:
-            st.write(f"Die Zahl {number} kommt nicht im Array vor.")
-        return False
-
-
-def ggt(a, b):
-    if b == 0:
-        return a
-    return ggt(b, a % b)
-
-
-def fermat(number, verbose):
-    if number == 1:
-        return False
-    for i in range(2, number):
-        nggt = ggt(number, i)
-        if verbose is True:
-            st.write(f"Bestimmung von ggT von {number} und {i} = {nggt}")
-        if nggt == 1:
-            if verbose is True:
-                latex = rf"{i}^{{{number - 1}}} mod {number}"
-                st.write(
-                    f"Da der größte gemeinsame Teiler gleich 1 ist, wird ${latex}$ berechnet."
-                )
-            if ((i ** (number - 1)) % number) != 1:
-                if verbose is True:
-                    latex = rf"{i}^{{{number - 1}}} mod {number}"
-                    st.write(f"Da ${latex}$ gleich 1 ist folgt draus:")
-                    st.write(f"Die Zahl {number} ist zusammengesetzt.")
-                return False
-    if verbose is True:
-        st.write(
-            f"Es wurden alle Zahlen von 2 bis {number - 1} probiert und da kein Zerlegung gefunden wurde folgt:"
-        )
-        st.write(
-            f"Die Zahl {number} scheint eine Primzahl zu sein, aber es könnte sich auch um eine Carmichael-Zahl handeln."
-        )
-    return True
-
-
-def legendre(a, n):
-    if a == 0:
-        return 0
-    if a == 1:
-        return 1
-    if a % 2 == 0:
-        if n % 8 == 1 or n % 8 == 7:
-            return legendre(a // 2, n)
-        else:
-            return -legendre(a // 2, n)
-    if a % 4 == 3 and n % 4 == 3:
-        return -legendre(n % a, a)
-    else:
-        return legendre(n % a, a)
-
-
-def solovaystrassen(number, k, verbose):
-    if number < 2:
-        if verbose is True:
-            st.write(f"Die Zahl {number} ist kleiner 2.")
-        return False
-    if number != 2 and number % 2 == 0:
-        if verbose is True:
-            st.write(f"Die Zahl {number} ist zusammengesetzt.")
-            st.write(f"weil die Zahl {number} ist gerade ist.")
-        return False
-    for _ in range(k):
-        a = random.randint(2, number - 1)
-        if verbose is True:
-            st.write(
-                f"Es wurde eine Zufallszahl {a} zwischen 2 und {number - 1} generiert."
-            )
-        x = legendre(a, number)
-        if verbose is True:
-            st.write(
-                f"Mit dieser Zufallszahl {a} wurde des Legendre-Symbol {x} berechnet."
-            )
-        if x == 0 or pow(a, (number - 1) // 2, number) != (x % number):
-            if verbose is True:
-                latex = rf"{a}^{{{((number - 1) / 2)}}} \equiv {x} mod {number}"
-                st.write(f"Da ${latex}$, folgt daraus:")
-                st.write(f"Die Zahl {number} ist zusammengesetzt.")
-            return False
-        else:
-            if verbose is True:
-                st.write(
-                    "Keine Aussage ist möglich und daher wählen einer neuen Zufallszahl a."
-                )
-    if verbose is True:
-        st.write(
-            f"Es wurden alle {k} Runden probiert und da kein Zerlegung gefunden wurde folgt:"
-        )
-        st.write(
-            f"Die Zahl {number} ist vermutlich prim da für die {k} Durchläufe kein Beweis gefunden wurde."
-        )
-    return True
-
-
-def millerrabin(number, runden, verbose):
-    if number <= 1:
-        if verbose is True:
-            st.write(f"Die Zahl {number} ist kleiner oder gleich 1.")
-        return False
-    if number <= 3:
-        if verbose is True:
-            st.write(f"Die Zahl {number} ist kleiner oder gleich 3.")
-        return True
-    if number % 2 == 0:
-        if verbose is True:
-            st.write(f"Die Zahl {number} ist durch 2 teilbar also kein Primzahl.")
-        return False
-    r, d = 0, number - 1
-    while d % 2 == 0:
-        d //= 2
-        r += 1
-
-    def millerrabinloop(a, verbose):
-        x = pow(a, d, number)
-        if verbose is True:
-            latex = rf"{a}^{{{d}}} mod {number}"
-            st.write(f"Die Zahl {x} wird durch ${latex}$ berechnet.")
-        if x == 1 or x == number - 1:
-            if verbose is True:
-                st.write(
-                    f"Da die Zahl {x} entweder 1 oder -1 entspricht, kann keine Aussage mit {a} getroffen werden."
-                )
-            return True
-        for _ in range(r - 1):
-            x = pow(x, 2, number)
-            if x == number - 1:
-                if verbose is True:
-                    st.write(
-                        f"Da die Zahl {x} = {number - 1} folgt, dass keine Aussage mit {a} getroffen werden kann."
-                    )
-                return True
-        if verbose is True:
-            st.write(
-                f"Mit der Zahl {a} lässt sich beweisen, dass {number} keine Primzahl ist."
-            )
-        return False
-
-    for _ in range(runden):
-        a = random.randint(2, number - 2)
-        if verbose is True:
-            st.write(
-                f"Es wird ein Zufallszahl {a} generiert zwischen 2 und {number -2}."
-            )
-            st.write(
-                f"Es wird ein Schreife zum Testen mit der Zufallszahl {a} begonnen."
-            )
-        if not millerrabinloop(a, verbose):
-            if verbose is True:
-                st.write(f"Die Zahl {number} ist zusammengesetzt.")
-            return False
-    if verbose is True:
-        st.write(
-            f"Die Zahl {number} ist vermutlich prim, da in den {runden} Runden kein Beweis für eine Zerlegung gefunden wurde."
-        )
-    return True
-
-
-def expand_x_1(number):
-    c = 1
-    for i in range(number // 2 + 1):
-        c = c * (number - i) // (i + 1)
-        yield c
-
-
-def aks(number):
-    if number == 1:
-        return False
-    if number == 2:
-        return True
-    for i in expand_x_1(number):
-        if i % number:
-            return False
-    return True
-
+from algorithmen.primzahltest import (
+    aks,
+    atkin,
+    bruteforce,
+    eratosthenes,
+    fermat,
+    millerrabin,
+    solovaystrassen,
+)
+from algorithmen.primzahlauswahl import estimate_cost, primality_test, select_method
+from algorithmen.protokoll import Protokoll
+from anzeige import protokoll_anzeigen
+from lenstra_lib import check_num
 
 # ----------------------------------------STREAMLIT----------------------------------------
 
 st.header("Primzahltest")
 
+METHODS = {
+    "Automatische Auswahl": "auto",
+    "Bruteforce-Methode": "bruteforce",
+    "Sieb des Eratosthenes": "eratosthenes",
+    "Sieb von Atkin": "atkin",
+    "Fermatscher Primzahltest": "fermat",
+    "Solovay-Strassen-Test": "solovaystrassen",
+    "Miller-Rabin-Test": "millerrabin",
+    "Agrawal-Kayal-Saxena-Primzahltest": "aks",
+}
+
 option = st.selectbox(
     "Welche Primzahltest-Methode soll gemacht werden?",
-    [
-        "Bruteforce-Methode",
-        "Sieb des Eratosthenes",
-        "Sieb von Atkin",
-        "Fermatscher Primzahltest",
-        "Solovay-Strassen-Test",
-        "Miller-Rabin-Test",
-        "Agrawal-Kayal-Saxena-Primzahltest",
-    ],
+    list(METHODS),
     index=0,
 )
 
 verbose = st.checkbox("Ist eine detailierte Beschreibung gewünscht?")
+trace = Protokoll() if verbose else None
+
+# a text input, st.number_input only holds numbers up to float precision
+text = st.text_input("Welche Zahl soll geprüft werden?", value="1")
+if not check_num(text) or int(text) < 1:
+    st.error("Bitte eine ganze Zahl größer oder gleich 1 eingeben.")
+    st.stop()
+number = int(text)
+
+# the rounds are chosen further down, the estimate assumes the maximum of 100
+if select_method(METHODS[option], number, runden=100) != METHODS[option]:
+    st.warning(
+        f"Die Methode \"{option}\" würde für {number} etwa {estimate_cost(METHODS[option], number, 100):.3g} Sekunden "
+        f"dauern, stattdessen wird die automatische Auswahl verwendet."
+    )
+    option = "Automatische Auswahl"
 
-number = st.number_input("Welche Zahl soll geprüft werden?", value=1, min_value=1)
+if option == "Automatische Auswahl":
+    st.write(
+        "Die automatische Auswahl verwendet den deterministischen Miller-Rabin-Test mit festen Basen. "
+        "Mersenne-, Fermat- und Proth-Zahlen werden mit dem Lucas-Lehmer-, Pépin- bzw. Proth-Test bewiesen, "
+        "oberhalb der festen Basen wird der Baillie-PSW-Test verwendet."
+    )
+    if primality_test(number, "auto", trace=trace)[0]:
+        st.write("Die Zahl " + str(number) + " ist eine Primzahl.")
+    else:
+        st.write("Die Zahl " + str(number) + " ist keine Primzahl.")
 
 # st.write(f"Die ausgewählte zu testende Zahl lautet: " + str(number))
 # st.write(f"Der ausgewählte Primzahltest lautet: " + str(option))
@@ -295,18 +76,18 @@ if option == "Bruteforce-Methode":
         + str(number)
         + " durch."
     )
-    if bruteforce(number, verbose):
+    if bruteforce(number, trace):
         st.write("Die Zahl " + str(number) + " ist eine Primzahl.")
     else:
         st.write("Die Zahl " + str(number) + " ist keine Primzahl.")
 
 if option == "Sieb des Eratosthenes":
     st.write(
-        "Bei dem Sieb des Eratosthenes werden alle Primzahlen die kleiner als "
+        "Bei dem Sieb des Eratosthenes werden alle Primzahlen bis zur Wurzel aus "
         + str(number)
-        + " sind als Teiler durchprobiert."
+        + " gesiebt und als Teiler durchprobiert."
     )
-    if eratosthenes(number, verbose):
+    if eratosthenes(number, trace):
         st.write("Die Zahl " + str(number) + " ist eine Primzahl.")
     else:
         st.write("Die Zahl " + str(number) + " ist keine Primzahl.")
@@ -317,7 +98,7 @@ if option == "Sieb von Atkin":
         "Er durchläuft ein Gitter von Zahlen und wendet bestimmte Modulo-Bedingungen an, um Zahlen zu markieren, die Primzahlen sein könnten. "
         "Schließlich entfernt er Vielfache von gefundenen Primzahlen, um die endgültige Liste der Primzahlen zu erstellen."
     )
-    if atkin(number, verbose):
+    if atkin(number, trace):
         st.write("Die Zahl " + str(number) + " ist eine Primzahl.")
     else:
         st.write("Die Zahl " + str(number) + " ist keine Primzahl.")
@@ -328,7 +109,7 @@ if option == "Fermatscher Primzahltest":
     st.write(
         rf"""Der Fermat-Primzahltest basiert auf dem kleinen Fermatschen Satz, der besagt, dass für eine Primzahl p und eine Basis a gilt: ${latex1}$. Um zu prüfen, ob eine Zahl n prim ist, wählt man eine Basis a  und überprüft, ob ${latex2}$. Wenn diese Bedingung nicht erfüllt ist, ist n definitiv keine Primzahl, aber wenn sie erfüllt ist, ist n wahrscheinlich prim, aber nicht garantiert."""
     )
-    if fermat(number, verbose):
+    if fermat(number, trace):
         st.write(
             "Die Zahl "
             + str(number)
@@ -349,7 +130,7 @@ if option == "Solovay-Strassen-Test":
         min_value=5,
         max_value=100,
     )
-    if solovaystrassen(number, runden, verbose):
+    if solovaystrassen(number, runden, trace):
         st.write(
             "Die Zahl "
             + str(number)
@@ -372,7 +153,7 @@ if option == "Miller-Rabin-Test":
         min_value=5,
         max_value=100,
     )
-    if millerrabin(number, runden, verbose):
+    if millerrabin(number, runden, trace):
         st.write("Die Zahl " + str(number) + " ist vermeintlich eine Primzahl.")
     else:
         st.write("Die Zahl " + str(number) + " ist keine Primzahl.")
@@ -397,3 +178,6 @@ if option == "Agrawal-Kayal-Saxena-Primzahltest":
         st.write(f"{number} ist eine Primzahl.")
     else:
         st.write(f"{number} ist keine Primzahl.")
+
+if trace is not None:
+    protokoll_anzeigen(trace, "primzahltest_seite")
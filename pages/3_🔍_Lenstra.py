@@ -5,7 +5,15 @@ import typing
 import streamlit as st
 
 from algorithmen.primzahltest import millerrabin
-from lenstra_lib import *
+from lenstra_lib import InvalidCurve, check_num, streamlit_lenstra
+from lenstra_lib.plots import (
+    draw_curve,
+    draw_multi_curve,
+    get_weierstrass_points,
+    is_on_curve,
+    valid_weierstrass,
+)
+from lenstra_lib.streamlit import set_default_session, sidebar_content
 
 # set state
 state = st.session_state
@@ -106,7 +114,7 @@ call_factorize = False
 if factorize:
 
     def is_prime(product: int) -> bool:
-        return millerrabin(product, 20, verbose=False)
+        return millerrabin(product, 0, trace=None, mode="deterministic")
 
     if not check_num(factorize):
         st.error(r"$n\:$ is not a number!", icon="⚠️")
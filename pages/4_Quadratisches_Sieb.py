@@ -29,7 +29,7 @@ def factorise(factorize):
     if not check_num(factorize):
         st.warning("Value is not a number!", icon="⚠️")
         return
-    if millerrabin(int(factorize), 20, False):
+    if millerrabin(int(factorize), 0, None, mode="deterministic"):
         st.warning(r"$n\:$ is probably prime!", icon="⚠️")
         return
     number = int(factorize)